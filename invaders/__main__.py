@@ -17,6 +17,9 @@ In addition, you should have the following subfolders
 
 Moving any of these folders or files will prevent the game from working properly
 
+Run the game with "python -O invaders" to use the production mode of game2d, which
+skips the argument checks on every call (see benchmark.py for the difference).
+
 Author: Walker M. White (wmw2)
 Date:   November 1, 2017 (Python 3 Version)
 """
@@ -25,4 +28,5 @@ from app import *
 
 # Application code
 if __name__ == '__main__':
-    Invaders(width=GAME_WIDTH,height=GAME_HEIGHT).run()
+    Invaders(width=GAME_WIDTH,height=GAME_HEIGHT,tick_rate=TICK_RATE,
+        retained=True).run()
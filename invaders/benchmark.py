@@ -0,0 +1,123 @@
+"""
+Benchmarks for the game2d hot paths used by Alien Invaders
+
+This script times the game2d calls made every frame by the game: the property
+setters that move and recolor objects, and the contains tests behind Ship.collides
+and Alien.collides.  It uses plain GObjects, so it never builds a
+Kivy graphics instruction and runs without a window.
+
+game2d checks every argument with assert statements, and those checks are a large
+share of the cost of a collision test.  Running Python with -O turns on the
+production mode of game2d, in which all of the checks are skipped.  This script
+reports both modes: it times the checked mode first, and then runs itself again
+with -O to time the production mode.
+
+It also times the software mixer of game2d, mixing every sound effect of the game
+at once into one block of audio.  The mixer never opens an audio device.
+
+    python benchmark.py          (reports both modes)
+    python -O benchmark.py       (reports only the production mode)
+
+Date: October 18, 2026
+"""
+from consts import *
+from game2d import *
+import subprocess
+import timeit
+import os.path
+import sys
+
+# PRIMARY RULE: This module may only create plain GObjects, never drawables.
+
+#: the number of calls timed for each benchmark
+BENCH_CALLS = 100000
+#: the number of times each benchmark is repeated (the best time is reported)
+BENCH_REPEAT = 5
+#: the number of audio blocks mixed by the mixer benchmark
+BENCH_BLOCKS = 200
+
+
+def benchSetters(obj):
+    """
+    Moves an object like a bolt or alien, setting its position every call.
+
+    Parameter obj: the object to move
+    Precondition: obj is a GObject
+    """
+    obj.x = 100.0
+    obj.y = 200.0
+
+
+def benchRecolor(obj):
+    """
+    Sets the fill color of an object, which the setter checks with is_color.
+
+    Parameter obj: the object to recolor
+    Precondition: obj is a GObject
+    """
+    obj.fillcolor = (1,0,0,1)
+
+
+def benchCollides(obj):
+    """
+    Tests the four corners of a bolt against an object, like Alien.collides.
+
+    Parameter obj: the object hit by the bolt
+    Precondition: obj is a GObject
+    """
+    left, bottom, right, top = (obj.x-BOLT_WIDTH/2,obj.y-BOLT_HEIGHT/2,
+                                obj.x+BOLT_WIDTH/2,obj.y+BOLT_HEIGHT/2)
+    return (obj.contains((left,top)) or obj.contains((left,bottom)) or
+            obj.contains((right,top)) or obj.contains((right,bottom)))
+
+
+def timeBench(bench,angle=0):
+    """
+    Returns the best time in nanoseconds of a single call of the benchmark.
+
+    Parameter bench: the benchmark to time
+    Precondition: bench is a function taking a GObject
+
+    Parameter angle: the angle of the object given to the benchmark
+    Precondition: angle is a number (int or float)
+    """
+    obj = GObject(x=100,y=200,width=ALIEN_WIDTH,height=ALIEN_HEIGHT,angle=angle)
+    times = timeit.repeat(lambda: bench(obj),number=BENCH_CALLS,repeat=BENCH_REPEAT)
+    return min(times)*1e9/BENCH_CALLS
+
+
+def timeMixer():
+    """
+    Returns the best time in microseconds to mix one block of every sound effect.
+
+    Every effect in SOUND_EFFECTS plays SOUND_POLYPHONY looping voices, spread
+    across the speakers, which is the most the game ever plays at once.
+    """
+    folder = os.path.join(os.path.dirname(os.path.abspath(__file__)),'Sounds')
+    mixer = SoundMixer(max_voices=len(SOUND_EFFECTS)*SOUND_POLYPHONY,folder=folder)
+    for source in SOUND_EFFECTS.values():
+        for voice in range(SOUND_POLYPHONY):
+            mixer.play(source,pan=voice*2.0/SOUND_POLYPHONY-1,loop=True)
+    times = timeit.repeat(mixer.mix,number=BENCH_BLOCKS,repeat=BENCH_REPEAT)
+    return min(times)*1e6/BENCH_BLOCKS
+
+
+def report():
+    """
+    Prints the time of every benchmark in the current mode.
+    """
+    mode = 'production' if PRODUCTION else 'checked'
+    print('game2d '+mode+' mode (ns per call)')
+    print('  setters           %8.1f' % timeBench(benchSetters))
+    print('  recolor           %8.1f' % timeBench(benchRecolor))
+    print('  collides          %8.1f' % timeBench(benchCollides))
+    print('  collides rotated  %8.1f' % timeBench(benchCollides,15))
+    print('  mixer (us/block)  %8.1f' % timeMixer())
+
+
+# Script code
+if __name__ == '__main__':
+    report()
+    if not PRODUCTION:
+        sys.stdout.flush()
+        subprocess.call([sys.executable,'-O']+sys.argv)
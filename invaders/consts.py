@@ -17,6 +17,8 @@ import sys
 GAME_WIDTH  = 800
 #: the height of the game display
 GAME_HEIGHT = 700
+#: the number of game updates per second (the game runs with a fixed timestep)
+TICK_RATE   = 60
 
 
 ### SHIP CONSTANTS ###
@@ -72,6 +74,19 @@ BOLT_HEIGHT = 16
 BOLT_SPEED  = 10
 # the number of ALIEN STEPS (not frames) between bolts
 BOLT_RATE   = 5
+# the maximum number of laser bolts on screen at once
+BOLT_CAPACITY = 64
+# the file to save the input of each finished game to, for replay.py (None to not save)
+REPLAY_FILE = None
+
+
+### SOUND CONSTANTS ###
+
+# the sound file for each sound event of a wave
+SOUND_EFFECTS = {'shipbolt':'pew1.wav','alienbolt':'pew2.wav',
+                 'shipexplode':'blast1.wav','alienexplode':'pop1.wav'}
+# the maximum number of copies of a sound effect that can play at once
+SOUND_POLYPHONY = 4
 
 
 ### GAME CONSTANTS ###
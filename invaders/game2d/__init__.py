@@ -4,13 +4,29 @@ A module to support simple 2D game development.
 This module is a simple wrapper around Kivy interfaces to make 2D game development
 simpler for students in CS 1110.
 
+Every function and property checks its arguments with assert statements, so mistakes
+are caught where they happen.  These checks have a real cost in code that runs every
+frame, like collision tests.  Once a game is finished, run it in production mode by
+starting Python with the -O flag (or setting the environment variable PYTHONOPTIMIZE)::
+
+    python -O invaders
+
+Python then removes every assert statement, so the package uses its unchecked code
+paths.  The constant ``PRODUCTION`` is True in this mode.
+
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from .gobject import GObject, GScene
+from .gaffine import Affine2
+from .gobject import GObject, GScene, PRODUCTION
 from .grectangle import GRectangle, GEllipse, GImage, GLabel
 from .gsprite import GSprite
+from .gbatch import GSpriteBatch
+from .gcache import TextureCache
+from .gatlas import TextureAtlas
+from .gloader import AssetLoader
+from .gfont import BitmapFont, GBitmapText
 from .gpath import GPath, GTriangle, GPolygon
 from .gview import GInput, GView
-from .sound import Sound, SoundLibrary
+from .sound import Sound, SoundEffect, SoundHandle, SoundLibrary, SoundMixer
 from .app import GameApp
\ No newline at end of file
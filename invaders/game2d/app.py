@@ -15,6 +15,7 @@ import kivy.app
 from kivy.config import Config
 from kivy.clock  import Clock
 
+from .gcache import TextureCache
 import os.path
 
 class GameApp(kivy.app.App):
@@ -35,9 +36,24 @@ class GameApp(kivy.app.App):
     
     :meth:`draw`: This method draws all of the objects to the screen.  The only 
     thing you should have in this method are calls to ``self.view.draw()``.
+    
+    By default, :meth:`update` is called once per animation frame with the (variable)
+    time since the last frame.  If you set the attribute ``tick_rate``, the game runs 
+    in fixed-timestep mode instead.  Then :meth:`update` is always called with a time 
+    step of ``1/tick_rate``, as many times per animation frame as needed to keep up with
+    the clock (at most ``max_steps``).  In this mode the attribute ``alpha`` is the 
+    fraction of a time step that has elapsed since the last call to :meth:`update`, 
+    which :meth:`draw` can use to interpolate.  So game speed no longer depends on how 
+    fast the game can render.
     """
     # Class attribute for tracking textures (to reduce memory footprint)
-    TEXTURE_CACHE = {}
+    TEXTURE_CACHE = TextureCache()
+    # Class attribute for tracking decoded sounds (to avoid reading them twice)
+    SOUND_CACHE = {}
+    # Class attribute for decoded WAV samples, as (rate, samples) by file name
+    SAMPLE_CACHE = {}
+    # Class attribute for the files in each asset folder (see rescan)
+    ASSET_INDEX = None
     
     
     # MUTABLE ATTRIBUTES
@@ -62,8 +78,63 @@ class GameApp(kivy.app.App):
         self._fps = value
         Clock.schedule_interval(self._refresh,1.0/self._fps)
     
+    @property
+    def tick_rate(self):
+        """
+        The number of simulation steps per second in fixed-timestep mode.
+        
+        If this value is None (the default), the game is not in fixed-timestep mode,
+        and :meth:`update` is called once per animation frame with a variable time
+        step. Otherwise, :meth:`update` is always called with a time step of 
+        ``1/tick_rate``, and :meth:`draw` can read the interpolation factor ``alpha``.
+        
+        **Invariant**: Must be None or an int or float > 0.
+        """
+        return self._tick_rate
+    
+    @tick_rate.setter
+    def tick_rate(self,value):
+        assert value is None or type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value is None or value > 0, 'value %s is not positive' % repr(value)
+        self._tick_rate = value
+        self._accumulator = 0.0
+    
+    @property
+    def max_steps(self):
+        """
+        The maximum number of simulation steps per animation frame.
+        
+        This value only matters in fixed-timestep mode.  If the game falls so far behind
+        that it needs more steps than this in a single animation frame, it runs this many
+        steps and drops the rest of the elapsed time.  That way a slow frame cannot make
+        the next frame even slower. The default value is 5.
+        
+        **Invariant**: Must be an int > 0.
+        """
+        return self._max_steps
+    
+    @max_steps.setter
+    def max_steps(self,value):
+        assert type(value) == int, 'value %s is not an int' % repr(value)
+        assert value > 0, 'value %s is not positive' % repr(value)
+        self._max_steps = value
+    
     
     # IMMUTABLE PROPERTIES
+    @property
+    def alpha(self):
+        """
+        The interpolation factor for the current call to :meth:`draw`.
+        
+        In fixed-timestep mode (see ``tick_rate``), this is the fraction of a time step
+        that has elapsed since the last call to :meth:`update`.  A game can use it to 
+        draw moving objects between their previous and current positions.  Otherwise, 
+        this value is always 1.
+        
+        **Invariant**: Must be a float in 0..1.
+        """
+        return self._alpha
+    
     @property
     def width(self):
         """
@@ -112,7 +183,9 @@ class GameApp(kivy.app.App):
         """
         Checks if ``name`` refers to an image file
     
-        The method searches the **Images** folder for the given file name.
+        The method searches the **Images** folder for the given file name.  It uses
+        the index of the folder built at startup (see :meth:`rescan`), so it does not
+        touch the file system.
     
         :param name: The file name
         :type name:  ``str``
@@ -123,14 +196,16 @@ class GameApp(kivy.app.App):
         if type(name) != str:
             return False
     
-        return os.path.exists(cls.images+'/'+name)
+        return cls._indexed('images',name)
     
     @classmethod
     def is_font(cls,name):
         """
         Checks if ``name`` refers to a font file
         
-        The method searches the **Fonts** folder for the given file name.
+        The method searches the **Fonts** folder for the given file name.  It uses
+        the index of the folder built at startup (see :meth:`rescan`), so it does not
+        touch the file system.
         
         :param name: The file name
         :type name:  ``str``
@@ -141,14 +216,16 @@ class GameApp(kivy.app.App):
         if type(name) != str:
             return False
         
-        return os.path.exists(cls.fonts+'/'+name)
+        return cls._indexed('fonts',name)
     
     @classmethod
     def is_sound(cls,name):
         """
         Checks if ``name`` refers to a sound file
         
-        The method searches the **Sounds** folder for the given file name.
+        The method searches the **Sounds** folder for the given file name.  It uses
+        the index of the folder built at startup (see :meth:`rescan`), so it does not
+        touch the file system.
         
         :param name: The file name
         :type name:  ``str``
@@ -159,10 +236,33 @@ class GameApp(kivy.app.App):
         if type(name) != str:
             return False
         
-        return os.path.exists(os.path.join(cls.sounds,name))
+        return cls._indexed('sounds',name)
     
     @classmethod
-    def load_texture(cls,name):
+    def rescan(cls):
+        """
+        Rebuilds the index of the **Images**, **Sounds** and **Fonts** folders.
+        
+        The index is built once when the game is created, so that :meth:`is_image`,
+        :meth:`is_font` and :meth:`is_sound` never have to check the file system.  If
+        the game adds, removes or renames files in these folders while it is running,
+        it must call this method for the changes to be seen.
+        
+        The index contains every file in each folder, including files in subfolders
+        (as paths relative to the folder).
+        """
+        index = {}
+        for key in ('images','sounds','fonts'):
+            folder = getattr(cls,key)
+            names = set()
+            for root, dirs, files in os.walk(folder):
+                for name in files:
+                    names.add(os.path.relpath(os.path.join(root,name),folder))
+            index[key] = frozenset(names)
+        cls.ASSET_INDEX = index
+    
+    @classmethod
+    def load_texture(cls,name,user=None,repeat=False):
         """
         Returns: The texture for the given file name, or None if it cannot be loaded
         
@@ -170,23 +270,195 @@ class GameApp(kivy.app.App):
         has already been loaded, it will return the cached texture.  Otherwise, it will
         load the texture and cache it before returning it.
         
+        If ``user`` is given, it is registered as an object drawing the texture, so the
+        texture is not evicted from the cache while that object exists (see
+        :class:`TextureCache`).  It should call :meth:`release_texture` if it stops
+        using the texture.
+        
+        If ``repeat`` is True, the texture wraps around (for tiling, as in a textured
+        :class:`GPolygon`).  The cached texture may be shared or a region of an atlas,
+        so it cannot be changed to wrap.  Instead, one separate copy of the file is
+        loaded and cached under the key ``(name,'repeat')``.
+        
         This method will crash if name is not a valid file.
         
         :param name: The file name
         :type name:  ``str``
+        
+        :param user: The object using the texture (or None)
+        :type user:  any object that supports weak references
+        
+        :param repeat: Whether to return the wrapping copy of the texture
+        :type repeat:  ``bool``
         """
         assert cls.is_image(name), '%s is not an image file' % repr(name)
-        if name in cls.TEXTURE_CACHE:
-            return cls.TEXTURE_CACHE[name]
+        key = (name,'repeat') if repeat else name
+        texture = cls.TEXTURE_CACHE.lookup(key)
+        if texture is None:
+            try:
+                from kivy.core.image import Image
+                if repeat:
+                    texture = Image(name,nocache=True).texture
+                    texture.wrap = 'repeat'
+                else:
+                    texture = Image(name).texture
+                cls.TEXTURE_CACHE[key] = texture
+            except:
+                texture = None
+        
+        if not user is None and not texture is None:
+            cls.TEXTURE_CACHE.acquire(key,user)
+        return texture
+    
+    @classmethod
+    def release_texture(cls,name,user,repeat=False):
+        """
+        Unregisters ``user`` as an object drawing the texture for the given file name.
         
-        try:
-            from kivy.core.image import Image
-            texture = Image(name).texture
-            cls.TEXTURE_CACHE[name] = texture
-        except:
-            texture = None
+        Once a texture has no users, it may be evicted from the cache to stay within
+        the memory budget (see the keyword ``texture_budget``).  This does nothing if
+        ``name`` is None or is not in the cache.
         
-        return texture
+        :param name: The file name
+        :type name:  ``str`` or None
+        
+        :param user: The object that was using the texture
+        :type user:  any object that supports weak references
+        
+        :param repeat: Whether the user had the wrapping copy of the texture
+        :type repeat:  ``bool``
+        """
+        if not name is None:
+            cls.TEXTURE_CACHE.release((name,'repeat') if repeat else name,user)
+    
+    @classmethod
+    def load_sound(cls,name):
+        """
+        Returns: The Kivy sound for the given file name, or None if it cannot be loaded
+
+        The ``name`` must refer to the file in the **Sounds** folder.  If the sound has
+        already been loaded, it will return the cached sound.  Otherwise, it will load
+        the sound and cache it before returning it.
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        assert cls.is_sound(name), '%s is not a sound file' % repr(name)
+        if name in cls.SOUND_CACHE:
+            return cls.SOUND_CACHE[name]
+
+        from kivy.core.audio import SoundLoader
+        sound = SoundLoader.load(os.path.join(cls.sounds,name))
+        if not sound is None:
+            cls.SOUND_CACHE[name] = sound
+        return sound
+
+    @classmethod
+    def unload_sound(cls,name):
+        """
+        Returns: The Kivy sound for the given file name, or None if it does not exist
+
+        The ``name`` should refer to the file in the sound cache.  If the sound is in
+        the cache, it will return the cached sound before removing it.  Otherwise, it
+        will return None.
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        assert type(name) == str, '%s is not a valid sound name' % repr(name)
+        cls.SAMPLE_CACHE.pop(name,None)
+        return cls.SOUND_CACHE.pop(name,None)
+
+    @classmethod
+    def manifest(cls):
+        """
+        Returns: A dictionary of every image and sound file of the game, by folder
+
+        The dictionary has the keys 'images' and 'sounds', and each value is a sorted
+        list of the file names in the **Images** and **Sounds** folders, taken from the
+        index (see :meth:`rescan`).  It is the default manifest of :meth:`preload`.
+        The font files are not listed, since only a font at a given size can be cached
+        (see :class:`BitmapFont`).
+        """
+        if cls.ASSET_INDEX is None:
+            cls.rescan()
+        result = {}
+        for key in ('images','sounds'):
+            result[key] = sorted(cls.ASSET_INDEX[key])
+        return result
+
+    @classmethod
+    def preload(cls,manifest=None,uploads=4,atlas=None):
+        """
+        Returns: A started :class:`AssetLoader` for the given manifest
+
+        The images and WAV files are decoded on a background thread, and the assets are
+        put in the caches a few at a time each animation frame.  The game keeps running in the 
+        meantime; use the attributes ``progress`` and ``done`` of the loader to show a 
+        loading screen.  In addition to the keys of :meth:`manifest`, the manifest may 
+        have the key 'fonts', a list of (font_name, font_size) pairs of bitmap fonts
+        to rasterize, and the key 'effects', a list of (file_name, polyphony) pairs of
+        sound effects to create with all of their voices.
+
+        If ``atlas`` is a page size, the decoded images are packed into a 
+        :class:`TextureAtlas` (see :meth:`build_atlas`) once they have all been decoded,
+        instead of becoming separate textures.  The loader attribute ``atlas`` is the
+        result.
+
+        This method must be called once the game is running, such as in ``start``.
+
+        :param manifest: The assets to load, as returned by :meth:`manifest` (all of them if None)
+        :type manifest:  ``dict`` or None
+
+        :param uploads: The maximum number of assets to cache per animation frame
+        :type uploads:  ``int`` > 0
+
+        :param atlas: The page size of an atlas for the images (no atlas if None)
+        :type atlas:  ``int`` > 0 or None
+        """
+        from .gloader import AssetLoader
+        if manifest is None:
+            manifest = cls.manifest()
+        loader = AssetLoader(manifest.get('images',()),manifest.get('sounds',()),
+                             manifest.get('fonts',()),uploads,manifest.get('effects',()),
+                             atlas)
+        loader.start()
+        return loader
+
+    @classmethod
+    def build_atlas(cls,names=None,size=1024,pixels=None):
+        """
+        Returns: A new :class:`TextureAtlas` of the given images, added to the texture cache
+
+        The images are packed into as few textures as possible.  Every image that is
+        packed is put in the texture cache as a region of the atlas, so :meth:`load_texture`
+        (and hence :class:`GImage` and :class:`GSprite`) use the atlas transparently.
+        Images that do not fit on a page are left out, and load as separate textures.
+
+        This method must be called once the game is running, such as in ``start``.  It
+        blocks until every image is read and decoded, unless the images were already
+        decoded and are given as ``pixels`` (as :meth:`preload` does with ``atlas``).
+
+        :param names: The file names of the images in the **Images** folder (all of them if None)
+        :type names:  ``list`` of ``str`` or None
+
+        :param size: The maximum width and height of each texture in the atlas
+        :type size:  ``int`` > 0
+
+        :param pixels: The decoded images, by file name (the files are read if None)
+        :type pixels:  ``dict`` of RGBA arrays (see :func:`load_pixels`) or None
+        """
+        from .gatlas import TextureAtlas
+        if names is None:
+            names = [name for name in cls.manifest()['images']
+                     if os.path.splitext(name)[1].lower() in ('.png','.jpg','.jpeg','.gif')]
+        for name in names:
+            assert cls.is_image(name), '%s is not an image file' % repr(name)
+        
+        atlas = TextureAtlas(names,cls.images,size,pixels=pixels)
+        for name in atlas.names:
+            cls.TEXTURE_CACHE.add(name,atlas.get(name),True)
+        return atlas
     
     @classmethod
     def unload_texture(cls,name):
@@ -195,18 +467,14 @@ class GameApp(kivy.app.App):
         
         The ``name`` should refer to the file in in the texture cache.  If the texture
         is in the cache, it will return the cached texture before removing it.  Otherwise, 
-        it will returning None.
+        it will returning None.  A texture still used by a live object is not removed
+        (and this returns None), as removing it would not free its memory.
         
         :param name: The file name
         :type name:  ``str``
         """
         assert type(name) == str, '%s is not a valid texture name' % repr(name)
-        if name in cls.TEXTURE_CACHE:
-            texture = cls.TEXTURE_CACHE[name]
-            del cls.TEXTURE_CACHE[name]
-            return texture
-        
-        return None
+        return cls.TEXTURE_CACHE.remove(name)
     
     # BUILT-IN METHODS
     def __init__(self,**keywords):
@@ -223,6 +491,12 @@ class GameApp(kivy.app.App):
         The game window will not show until you start the game. To start the game, use 
         the method ``run()``.
         
+        The keywords ``tick_rate`` and ``max_steps`` turn on fixed-timestep mode. See
+        the documentation of those attributes for more information.  The keyword
+        ``retained`` puts the view in retained mode; see :class:`GView`.  The keyword
+        ``texture_budget`` sets the number of bytes of textures to keep in the texture
+        cache (by default it is unbounded); see :class:`TextureCache`.
+        
         **You will never call the constructor or run yourself**.  That is handled for 
         you in the provided code.
         
@@ -232,6 +506,12 @@ class GameApp(kivy.app.App):
         w = keywords.pop('width', 0.0)
         h = keywords.pop('height', 0.0)
         f = keywords.pop('fps', 60.0)
+        self.tick_rate = keywords.pop('tick_rate', None)
+        self._alpha = 1.0
+        self.max_steps = keywords.pop('max_steps', 5)
+        self._retained = keywords.pop('retained', False)
+        assert type(self._retained) == bool, 'retained %s is not a bool' % repr(self._retained)
+        self.TEXTURE_CACHE.budget = keywords.pop('texture_budget', None)
 
         assert type(w) in [int,float], 'width %s is not a number' % repr(w)
         assert type(h) in [int,float], 'height %s is not a number' % repr(h)
@@ -261,6 +541,7 @@ class GameApp(kivy.app.App):
         from .gview import GInput, GView
         self._view = GView()
         self._view.size_hint = (1,1)
+        self._view.retained = self._retained
         self._input = GInput()
         self._input._register(self._view)
         return self.view
@@ -321,11 +602,35 @@ class GameApp(kivy.app.App):
         
         Every single object that you draw will need to be an attribute of the ``GameApp``
         class.  This method should largely be a sequence of calls to ``self.view.draw()``.
+        
+        In fixed-timestep mode (see ``tick_rate``), the attribute ``alpha`` is the 
+        fraction of a time step that has elapsed since the last call to :meth:`update`.
+        You can use it to draw moving objects between their previous and current 
+        positions.
         """
         pass
     
     
     # HIDDEN METHODS
+    @classmethod
+    def _indexed(cls,key,name):
+        """
+        Returns True if ``name`` is a file in the asset folder for ``key``.
+        
+        This looks the name up in the index built by :meth:`rescan`.  If there is no
+        index yet, it checks the file system instead.
+        
+        :param key: The asset folder ('images', 'sounds' or 'fonts')
+        :type key:  ``str``
+        
+        :param name: The file name
+        :type name:  ``str``
+        """
+        if cls.ASSET_INDEX is None:
+            return os.path.isfile(os.path.join(getattr(cls,key),name))
+        index = cls.ASSET_INDEX[key]
+        return name in index or os.path.normpath(name) in index
+    
     def _bootstrap(self,dt):
         """
         Bootstraps the clock scheduler for the game..
@@ -344,14 +649,34 @@ class GameApp(kivy.app.App):
         Processes a single animation frame.
         
         This method a callback-proxy for the methods `update` and `draw`.  It handles
-        important issues behind the scenes, particularly with clearing the window.
+        important issues behind the scenes, particularly with clearing the window. In 
+        fixed-timestep mode, it also runs as many simulation steps as the elapsed time 
+        requires before drawing.
         
         :param dt: time in seconds since last update
         :type dt:  ``int`` or ``float``
         """
         self.view.clear()
-        self.update(dt)
+        if self._tick_rate is None:
+            self._alpha = 1.0
+            self.update(dt)
+            self.draw()
+            self.view._commit()
+            return
+        
+        step = 1.0/self._tick_rate
+        self._accumulator += dt
+        steps = 0
+        while self._accumulator >= step and steps < self._max_steps:
+            self.update(step)
+            self._accumulator -= step
+            steps += 1
+        if self._accumulator >= step:
+            # Too far behind; drop the time we cannot catch up on
+            self._accumulator = 0.0
+        self._alpha = self._accumulator/step
         self.draw()
+        self.view._commit()
     
     def _setpaths(self):
         """
@@ -373,4 +698,5 @@ class GameApp(kivy.app.App):
         kivy.resources.resource_add_path(GameApp.fonts)
         kivy.resources.resource_add_path(GameApp.sounds)
         kivy.resources.resource_add_path(GameApp.images)
+        GameApp.rescan()
 
@@ -0,0 +1,252 @@
+"""
+Texture atlases for 2D game support.
+
+This module packs many small images into a few large textures.  Every texture that a
+frame uses has to be bound before it can be drawn, and every texture is a separate
+upload to the graphics card.  Packing the images of a game into one atlas means one
+upload at startup and far fewer binds while drawing.
+
+The images in an atlas are available as texture regions.  Kivy draws a region exactly
+like a texture, so :class:`GImage`, :class:`GSprite` and :class:`GSpriteBatch` use them
+without any changes.  See :meth:`GameApp.build_atlas` to put the regions in the texture
+cache, so that these classes find them by file name.
+
+Decoding an image (:func:`load_pixels`) does not touch the graphics card, so it can
+run on a background thread.  Only making the textures (:func:`make_texture` and the
+pages of an atlas) has to happen on the main thread.  An atlas can be built from
+pixels that were decoded elsewhere, which is how :class:`AssetLoader` builds one.
+
+Date:   October 18, 2026
+"""
+from kivy.graphics.texture import Texture
+import numpy as np
+import os.path
+
+
+# The pixel formats that we can pack, and the positions of r, g, b and a in each
+PIXEL_FORMATS = {'rgba':(0,1,2,3),'bgra':(2,1,0,3),'argb':(1,2,3,0),
+                 'rgb':(0,1,2,None),'bgr':(2,1,0,None)}
+
+
+def load_pixels(path):
+    """
+    Returns the pixels of an image file as an RGBA array, bottom row first.
+
+    This returns None if the image cannot be loaded or has an unsupported format.  It
+    only decodes the file, and does not make a texture, so it is safe to call on a
+    background thread.
+
+    :param path: the path to the image file
+    :type path:  ``str``
+    """
+    from kivy.core.image import ImageLoader
+    try:
+        data = ImageLoader.load(path)._data[0]
+    except:
+        return None
+    if not data.fmt in PIXEL_FORMATS:
+        return None
+
+    order = PIXEL_FORMATS[data.fmt]
+    depth = len(data.fmt)
+    stride = data.rowlength if data.rowlength else data.width*depth
+    raw = np.frombuffer(data.data,dtype=np.uint8,count=stride*data.height)
+    raw = raw.reshape(data.height,stride)[:,:data.width*depth]
+    raw = raw.reshape(data.height,data.width,depth)
+
+    pixels = np.empty((data.height,data.width,4),dtype=np.uint8)
+    for channel in range(4):
+        if order[channel] is None:
+            pixels[:,:,channel] = 255
+        else:
+            pixels[:,:,channel] = raw[:,:,order[channel]]
+    if data.flip_vertical:
+        pixels = pixels[::-1]
+    return pixels
+
+
+def make_texture(pixels):
+    """
+    Returns a new texture with the given pixels.
+
+    This uploads the pixels to the graphics card, so it must be called on the main
+    thread once the game window exists.
+
+    :param pixels: the pixels of the image, bottom row first
+    :type pixels:  ``numpy.ndarray`` of RGBA bytes
+    """
+    height, width = pixels.shape[:2]
+    texture = Texture.create(size=(width,height),colorfmt='rgba')
+    texture.blit_buffer(np.ascontiguousarray(pixels).tobytes(),colorfmt='rgba',bufferfmt='ubyte')
+    return texture
+
+
+def next_power(value):
+    """
+    Returns the smallest power of two that is at least ``value``.
+
+    :param value: the value to round up
+    :type value:  ``int`` > 0
+    """
+    result = 1
+    while result < value:
+        result *= 2
+    return result
+
+
+# #mark -
+class TextureAtlas(object):
+    """
+    A class representing a set of images packed into a few textures.
+
+    The images are packed into pages, each a texture no larger than ``size`` pixels on a
+    side.  They are placed on horizontal shelves, tallest first, with ``padding`` empty
+    pixels around each image so that filtering does not bleed neighbors into an image.
+    An image that is larger than a page is skipped, and should be loaded on its own.
+
+    All of the pixels are assembled in memory first, so each page is uploaded to the
+    graphics card exactly once.  That means the atlas must be built after the game
+    window exists (e.g. in the ``start`` method of :class:`GameApp`).  If the pixels
+    were already decoded (see :func:`load_pixels`), pass them as ``pixels`` so that
+    building the atlas does not read any files.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def pages(self):
+        """
+        The textures holding the packed images.
+
+        **Invariant**: Value is a tuple of Kivy textures.
+        """
+        return tuple(self._pages)
+
+    @property
+    def names(self):
+        """
+        The file names of the images in this atlas.
+
+        **Invariant**: Value is a tuple of strings.
+        """
+        return tuple(self._regions.keys())
+
+
+    # BUILT-IN METHODS
+    def __init__(self,names,folder='',size=1024,padding=1,pixels=None):
+        """
+        Creates a new atlas from the given image files.
+
+        :param names: the file names of the images to pack
+        :type names:  ``list`` of ``str``
+
+        :param folder: the folder containing the images
+        :type folder:  ``str``
+
+        :param size: the maximum width and height of a page
+        :type size:  ``int`` > 0
+
+        :param padding: the number of empty pixels around each image
+        :type padding:  ``int`` >= 0
+
+        :param pixels: the decoded images, by name (the files are read if None)
+        :type pixels:  ``dict`` of RGBA arrays (or None for an image that failed)
+        """
+        assert type(size) == int and size > 0, '%s is not a valid page size' % repr(size)
+        assert type(padding) == int and padding >= 0, '%s is not a valid padding' % repr(padding)
+        self._size = size
+        self._padding = padding
+        self._pages = []
+        self._regions = {}
+
+        images = []
+        decoded = pixels
+        for name in names:
+            if decoded is None:
+                pixels = self._load(os.path.join(folder,name))
+            else:
+                pixels = decoded.get(name)
+            if not pixels is None and max(pixels.shape[:2])+2*padding <= size:
+                images.append((name,pixels))
+        images.sort(key=lambda item: (-item[1].shape[0],item[0]))
+
+        placed = []
+        buffer = None
+        x = y = shelf = 0
+        for name, pixels in images:
+            h, w = pixels.shape[:2]
+            if x+w+2*padding > size:
+                x = 0
+                y += shelf
+                shelf = 0
+            if buffer is None or y+h+2*padding > size:
+                if not buffer is None:
+                    self._upload(buffer,y+shelf,placed)
+                buffer = np.zeros((size,size,4),dtype=np.uint8)
+                placed = []
+                x = y = shelf = 0
+            buffer[y+padding:y+padding+h,x+padding:x+padding+w] = pixels
+            placed.append((name,x+padding,y+padding,w,h))
+            x += w+2*padding
+            shelf = max(shelf,h+2*padding)
+        if placed:
+            self._upload(buffer,y+shelf,placed)
+
+    def __contains__(self,name):
+        """
+        Returns True if the image ``name`` is in this atlas.
+
+        :param name: the file name
+        :type name:  ``str``
+        """
+        return name in self._regions
+
+
+    # PUBLIC METHODS
+    def get(self,name):
+        """
+        Returns the texture region of the given image, or None if it is not packed.
+
+        :param name: the file name
+        :type name:  ``str``
+        """
+        return self._regions.get(name)
+
+
+    # HIDDEN METHODS
+    def _load(self,path):
+        """
+        Returns the pixels of an image as an RGBA array, bottom row first.
+
+        This returns None if the image cannot be loaded or has an unsupported format.
+        See :func:`load_pixels`.
+
+        :param path: the path to the image file
+        :type path:  ``str``
+        """
+        return load_pixels(path)
+
+    def _upload(self,buffer,height,placed):
+        """
+        Uploads a page and creates the regions of the images on it.
+
+        The page is trimmed to the smallest power of two in each direction that holds
+        every image.
+
+        :param buffer: the pixels of the page, bottom row first
+        :type buffer:  ``numpy.ndarray`` of RGBA bytes
+
+        :param height: the number of rows in use
+        :type height:  ``int`` > 0
+
+        :param placed: the images on this page, as (name, x, y, width, height)
+        :type placed:  ``list`` of ``tuple``
+        """
+        width  = max(x+w+self._padding for (name,x,y,w,h) in placed)
+        width  = min(next_power(width),self._size)
+        height = min(next_power(height),self._size)
+        page = Texture.create(size=(width,height),colorfmt='rgba')
+        page.blit_buffer(np.ascontiguousarray(buffer[:height,:width]).tobytes(),
+                         colorfmt='rgba',bufferfmt='ubyte')
+        self._pages.append(page)
+        for name, x, y, w, h in placed:
+            self._regions[name] = page.get_region(x,y,w,h)
@@ -0,0 +1,239 @@
+"""
+Batched drawables for 2D game support.
+
+This module supports drawing many copies of the same image at once.  Every
+:class:`GImage` has its own drawing cache, with its own transforms, color and rectangle.
+That is fine for a few images, but a screen full of identical sprites then issues
+several Kivy instructions per sprite.  A sprite batch draws all of its sprites as a
+single textured mesh instead, so the cost of drawing depends on the number of textures,
+not the number of sprites.
+
+Date:   October 18, 2026
+"""
+from kivy.graphics import *
+from kivy.graphics.instructions import *
+from .gobject import GObject, is_gobject_list
+from .app import GameApp
+import numpy as np
+import math
+
+
+# #mark -
+class GSpriteBatch(GObject):
+    """
+    A class representing many copies of a single image, drawn as one mesh.
+
+    The image is given by a JPEG, PNG, or GIF file whose name is stored in the attribute
+    `source`, just like :class:`GImage`.  The copies are the objects in the attribute
+    ``children``.  Only the position, size, angle and scale of each child are used; the
+    child is never drawn itself.  The children are typically :class:`GImage` objects with
+    the same source, but any :class:`GObject` will do.
+
+    All of the children are drawn as if the point (x,y) of the batch is the origin, as
+    in :class:`GScene`.  If you define ``fillcolor``, the batch tints every copy by that
+    color.
+
+    The vertices of the mesh are rebuilt from the children whenever ``children`` is
+    assigned, whenever :meth:`refresh` is called, and every time the batch is drawn with
+    :meth:`draw`.  If the batch is inside of a :class:`GScene`, it is drawn with its
+    parent instead, so you must call :meth:`refresh` after moving a child.
+
+    If the copies are all the same size and never rotate, they do not need to be
+    objects at all.  Use :meth:`place` to give the centers of the copies as two
+    sequences of numbers (such as NumPy arrays) instead.  The mesh is then only rebuilt
+    when :meth:`place` is called again.
+    """
+
+    # MUTABLE PROPERTIES
+    @property
+    def source(self):
+        """
+        The source file for the image of every copy.
+
+        **invariant**. Value be a string refering to a valid file.
+        """
+        return self._source
+
+    @source.setter
+    def source(self,value):
+        assert value is None or GameApp.is_image(value), '%s is not an image file' % repr(value)
+        if self._defined and value != self._source:
+            GameApp.release_texture(self._source,self)
+        self._source = value
+        if self._defined:
+            self._texture = None if value is None else GameApp.load_texture(value,self)
+            self._mesh.texture = self._texture
+            self.refresh()
+
+    @property
+    def children(self):
+        """
+        The list of objects drawn as copies of the image.
+
+        **invariant**: Value must be a list or tuple of :class:`GObject` (possibly empty)
+        """
+        return tuple(self._children)
+
+    @children.setter
+    def children(self,value):
+        assert is_gobject_list(value), '%s is not a list of valid objects' % repr(value)
+        self._children = list(value)
+        self._quads = None
+        if self._defined:
+            self.refresh()
+
+
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """
+        Creates a new sprite batch.
+
+        To use the constructor for this class, you should provide it with a list of
+        keyword arguments that initialize various attributes. For example, to draw the
+        images ``img1`` and ``img2`` of ``beach-ball.png`` together, use the constructor::
+
+            GSpriteBatch(source='beach-ball.png',children=[img1,img2])
+
+        This class supports the same keywords as :class:`GObject` plus the additional
+        keywords ``source`` and ``children``.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self._defined = False
+        self._quads = None
+        self.source = keywords['source'] if 'source' in keywords else None
+        self.children = keywords['children'] if 'children' in keywords else []
+        self._texture = None
+        self._mesh = None
+        GObject.__init__(self,**keywords)
+        self._reset()
+        self._defined = True
+
+
+    # PUBLIC METHODS
+    def place(self,xs,ys,width,height):
+        """
+        Draws a copy of the image centered at each point, instead of the children.
+
+        Every copy has the given width and height, and no rotation.  The points are in
+        the coordinates of the batch (see ``children``).  This replaces the children
+        with an empty list.
+
+        :param xs: The x-coordinates of the centers of the copies
+        :type xs:  sequence of numbers (e.g. a NumPy array)
+
+        :param ys: The y-coordinates of the centers of the copies
+        :type ys:  sequence of numbers of the same length as ``xs``
+
+        :param width: The width of each copy
+        :type width:  ``int`` or ``float`` > 0
+
+        :param height: The height of each copy
+        :type height:  ``int`` or ``float`` > 0
+        """
+        assert len(xs) == len(ys), 'the points %s and %s have different lengths' % (repr(xs),repr(ys))
+        assert type(width) in [int,float] and width > 0, '%s is not a valid width' % repr(width)
+        assert type(height) in [int,float] and height > 0, '%s is not a valid height' % repr(height)
+        self._children = []
+        self._quads = (np.asarray(xs,dtype=float),np.asarray(ys,dtype=float),width,height)
+        self.refresh()
+
+    def refresh(self):
+        """
+        Rebuilds the vertices of the mesh from the children (or the points of :meth:`place`).
+
+        Each copy is a quad of four vertices (two triangles).  The texture coordinates
+        come from the texture itself, so this also works for a region of a texture.
+        """
+        if self._mesh is None:
+            return
+
+        if self._texture is None:
+            coords = (0.0,0.0,1.0,0.0,1.0,1.0,0.0,1.0)
+        else:
+            coords = self._texture.tex_coords
+
+        if not self._quads is None:
+            self._refresh_quads(coords)
+            return
+
+        vertices = []
+        indices  = []
+        for pos in range(len(self._children)):
+            child = self._children[pos]
+            sx, sy = child.scale
+            hw = child.width*sx/2.0
+            hh = child.height*sy/2.0
+            corners = ((-hw,-hh),(hw,-hh),(hw,hh),(-hw,hh))
+            angle = child.angle
+            if angle:
+                cos = math.cos(math.radians(angle))
+                sin = math.sin(math.radians(angle))
+                corners = [(cx*cos-cy*sin,cx*sin+cy*cos) for (cx,cy) in corners]
+            x = child.x
+            y = child.y
+            for corner in range(4):
+                vertices.extend((x+corners[corner][0],y+corners[corner][1],
+                                 coords[2*corner],coords[2*corner+1]))
+            base = 4*pos
+            indices.extend((base,base+1,base+2,base+2,base+3,base))
+
+        self._mesh.vertices = vertices
+        self._mesh.indices  = indices
+
+    def draw(self, view):
+        """
+        Draws all of the copies in the provide view.
+
+        This rebuilds the mesh from the current positions of the children first.
+
+        :param view: view to draw to
+        :type view:  :class:`GView`
+        """
+        if self._quads is None:
+            self.refresh()
+        GObject.draw(self,view)
+
+
+    # HIDDEN METHODS
+    def _refresh_quads(self,coords):
+        """
+        Rebuilds the vertices of the mesh from the points given to :meth:`place`.
+
+        :param coords: The texture coordinates of the four corners
+        :type coords:  sequence of 8 floats
+        """
+        xs, ys, width, height = self._quads
+        count = len(xs)
+        vertices = np.empty((count,4,4))
+        vertices[:,:,0] = xs[:,np.newaxis]+np.array((-width,width,width,-width))/2.0
+        vertices[:,:,1] = ys[:,np.newaxis]+np.array((-height,-height,height,height))/2.0
+        vertices[:,:,2] = coords[0::2]
+        vertices[:,:,3] = coords[1::2]
+        indices = 4*np.arange(count)[:,np.newaxis]+np.array((0,1,2,2,3,0))
+        self._mesh.vertices = vertices.ravel().tolist()
+        self._mesh.indices  = indices.ravel().tolist()
+
+    def _cull_bounds(self):
+        """
+        Returns None, as a batch is never culled.
+
+        The copies can be anywhere, and are not part of the size of the batch.
+        """
+        return None
+
+    def _reset(self):
+        """
+        Resets the drawing cache.
+        """
+        GObject._reset(self)
+        self._texture = None if self.source is None else GameApp.load_texture(self.source,self)
+        self._mesh = Mesh(mode='triangles',texture=self._texture)
+        self.refresh()
+        if not self._fillcolor is None:
+            self._cache.add(self._fillcolor)
+        else:
+            self._cache.add(Color(1,1,1))
+        self._cache.add(self._mesh)
+        self._cache.add(PopMatrix())
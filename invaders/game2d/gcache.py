@@ -0,0 +1,369 @@
+"""
+The texture cache for 2D game support.
+
+This module provides the cache behind :meth:`GameApp.load_texture`.  Every image is
+loaded once and shared by all of the objects that use it.  The cache also keeps track
+of which objects use each texture, and how much memory each texture takes.  If you set
+a memory budget, the textures that no object is using are evicted (least recently used
+first) whenever the cache grows past the budget.  So a long running game that loads
+many images does not keep every one of them forever.
+
+Date:   October 18, 2026
+"""
+from collections import OrderedDict
+import weakref
+
+
+# #mark -
+class TextureCache(object):
+    """
+    A class representing a cache of textures by file name.
+
+    This class supports the dictionary interface (``cache[name]``, ``name in cache``,
+    ``del cache[name]``) so it can be used like the plain dictionary it replaces.  In
+    addition, an object using a texture should register with :meth:`acquire`, and
+    unregister with :meth:`release` when it switches to another image.  The cache only
+    holds weak references to these objects, so an object that is deleted no longer
+    counts as a user, even if it never called :meth:`release`.  When a user is deleted,
+    the cache is marked stale, and the next call to :meth:`lookup`, :meth:`add` or
+    :meth:`acquire` evicts the textures it no longer needs.
+
+    A name is usually a file name, but it may be any hashable key.  For example,
+    :meth:`GameApp.load_texture` keeps wrapping textures under ``(name,'repeat')``.
+
+    The size of a texture is its decoded size (width x height x bytes per pixel).  A
+    texture region (such as a frame of an atlas) counts as the size of the region.
+    Textures added with ``pinned=True`` are never evicted.
+    """
+
+    # MUTABLE PROPERTIES
+    @property
+    def budget(self):
+        """
+        The maximum number of bytes of textures to keep in the cache.
+
+        If this value is None (the default), the cache is unbounded.  Otherwise, the
+        least recently used textures are evicted until the cache fits the budget.  A
+        texture in use (or pinned) is never evicted, so the cache can still go over
+        budget if every texture is in use.
+
+        **Invariant**: Must be None or an ``int`` >= 0.
+        """
+        return self._budget
+
+    @budget.setter
+    def budget(self,value):
+        assert value is None or (type(value) == int and value >= 0), '%s is not a valid budget' % repr(value)
+        self._budget = value
+        self._evict()
+
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def size(self):
+        """
+        The number of bytes of all of the textures in the cache.
+
+        **Invariant**: Value is an ``int`` >= 0.
+        """
+        return self._size
+
+    @property
+    def hits(self):
+        """
+        The number of lookups that found their texture in the cache.
+
+        **Invariant**: Value is an ``int`` >= 0.
+        """
+        return self._hits
+
+    @property
+    def misses(self):
+        """
+        The number of lookups that had to load their texture.
+
+        **Invariant**: Value is an ``int`` >= 0.
+        """
+        return self._misses
+
+    @property
+    def evictions(self):
+        """
+        The number of textures evicted to stay within the budget.
+
+        **Invariant**: Value is an ``int`` >= 0.
+        """
+        return self._evictions
+
+    @property
+    def stats(self):
+        """
+        A summary of this cache, for logging or display.
+
+        The keys are 'count', 'size', 'budget', 'hits', 'misses' and 'evictions'.
+
+        **Invariant**: Value is a ``dict``.
+        """
+        return {'count':len(self._textures),'size':self._size,'budget':self._budget,
+                'hits':self._hits,'misses':self._misses,'evictions':self._evictions}
+
+
+    # BUILT-IN METHODS
+    def __init__(self,budget=None):
+        """
+        Creates a new, empty texture cache.
+
+        :param budget: The maximum number of bytes to keep (unbounded if None)
+        :type budget:  ``int`` >= 0 or None
+        """
+        # The textures, in order of use (least recent first)
+        self._textures = OrderedDict()
+        # For each name, (size, pinned, set of users)
+        self._entries = {}
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        # Whether a user was deleted since the last eviction
+        self._stale = False
+        self.budget = budget
+
+    def __len__(self):
+        """
+        :return: The number of textures in this cache.
+        :rtype:  ``int`` >= 0
+        """
+        return len(self._textures)
+
+    def __contains__(self,name):
+        """
+        :return: True if the texture for ``name`` is in this cache.
+        :rtype:  ``bool``
+        """
+        return name in self._textures
+
+    def __iter__(self):
+        """
+        :return: The iterator for the names in this cache.
+        :rtype:  ``iterable``
+        """
+        return iter(self._textures.keys())
+
+    def __getitem__(self,name):
+        """
+        Accesses the texture for the given name.
+
+        Unlike :meth:`lookup`, this does not count as a hit or miss.
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        return self._textures[name]
+
+    def __setitem__(self,name,texture):
+        """
+        Adds the texture for the given name, as an unpinned texture.
+
+        :param name: The file name
+        :type name:  ``str``
+
+        :param texture: The texture for the file
+        :type texture:  A Kivy texture
+        """
+        self.add(name,texture)
+
+    def __delitem__(self,name):
+        """
+        Removes the texture for the given name, even if it is in use.
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        self._drop(name)
+
+
+    # PUBLIC METHODS
+    def keys(self):
+        """
+        :return: The names in this cache, least recently used first.
+        :rtype:  ``iterable``
+        """
+        return self._textures.keys()
+
+    def get(self,name,default=None):
+        """
+        Returns the texture for the given name, or ``default`` if it is not cached.
+
+        Like ``cache[name]``, this does not count as a hit or miss.
+
+        :param name: The file name
+        :type name:  ``str``
+
+        :param default: The value to return if there is no texture
+        :type default:  any
+        """
+        return self._textures.get(name,default)
+
+    def lookup(self,name):
+        """
+        Returns the texture for the given name, or None if it is not cached.
+
+        This is the lookup used by :meth:`GameApp.load_texture`.  It counts as a hit
+        or a miss, and a hit makes the texture the most recently used.
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        if self._stale:
+            self._evict()
+        if name in self._textures:
+            self._hits += 1
+            self._textures.move_to_end(name)
+            return self._textures[name]
+        self._misses += 1
+        return None
+
+    def add(self,name,texture,pinned=False):
+        """
+        Adds the texture for the given name, replacing any texture already there.
+
+        The users of a replaced texture are kept.  If the cache is over budget, this
+        evicts other textures (never the one just added).
+
+        :param name: The file name
+        :type name:  ``str``
+
+        :param texture: The texture for the file
+        :type texture:  A Kivy texture
+
+        :param pinned: Whether the texture can never be evicted
+        :type pinned:  ``bool``
+        """
+        users = self._entries[name][2] if name in self._entries else weakref.WeakSet()
+        if name in self._textures:
+            self._drop(name)
+        size = self._sizeof(texture)
+        self._textures[name] = texture
+        self._entries[name] = (size,pinned,users)
+        self._size += size
+        self._evict(name)
+
+    def remove(self,name):
+        """
+        Returns the texture for the given name after removing it, or None.
+
+        A texture that is still in use is not removed, and this returns None.  This
+        is the method used by :meth:`GameApp.unload_texture`.
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        if not name in self._textures or self.refs(name) > 0:
+            return None
+        return self._drop(name)
+
+    def acquire(self,name,user):
+        """
+        Registers ``user`` as an object drawing the texture for the given name.
+
+        A texture with at least one user is never evicted.  Registering the same
+        user twice has no effect.  When the user is deleted, the cache is marked
+        stale, so that its textures can be evicted without a call to :meth:`release`.
+
+        :param name: The file name
+        :type name:  ``str``
+
+        :param user: The object using the texture
+        :type user:  any object that supports weak references
+        """
+        if self._stale:
+            self._evict(name)
+        if name in self._entries:
+            users = self._entries[name][2]
+            if not user in users:
+                users.add(user)
+                weakref.finalize(user,self._expire)
+
+    def release(self,name,user):
+        """
+        Unregisters ``user`` as an object drawing the texture for the given name.
+
+        If the texture no longer has any users, it may be evicted.
+
+        :param name: The file name
+        :type name:  ``str``
+
+        :param user: The object that was using the texture
+        :type user:  any object that supports weak references
+        """
+        if name in self._entries:
+            self._entries[name][2].discard(user)
+            self._evict()
+
+    def refs(self,name):
+        """
+        Returns the number of live objects using the texture for the given name.
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        return len(self._entries[name][2]) if name in self._entries else 0
+
+    def clear(self):
+        """
+        Removes every texture from the cache, but keeps the statistics.
+        """
+        self._textures.clear()
+        self._entries.clear()
+        self._size = 0
+
+
+    # HIDDEN METHODS
+    def _expire(self):
+        """
+        Marks this cache as stale, as a user has been deleted.
+
+        This does not evict anything, as it is called during garbage collection.
+        """
+        self._stale = True
+
+    def _sizeof(self,texture):
+        """
+        Returns the decoded size of a texture in bytes.
+
+        :param texture: The texture to measure
+        :type texture:  A Kivy texture (or None)
+        """
+        if texture is None:
+            return 0
+        return int(texture.width)*int(texture.height)*len(texture.colorfmt)
+
+    def _drop(self,name):
+        """
+        Returns the texture for the given name after removing it from the cache.
+
+        :param name: The file name
+        :type name:  ``str``
+        """
+        texture = self._textures.pop(name)
+        self._size -= self._entries[name][0]
+        del self._entries[name]
+        return texture
+
+    def _evict(self,keep=None):
+        """
+        Evicts unused textures, least recently used first, until the cache fits.
+
+        :param keep: The name of a texture that must not be evicted
+        :type keep:  ``str`` or None
+        """
+        self._stale = False
+        if self._budget is None or self._size <= self._budget:
+            return
+        for name in list(self._textures.keys()):
+            if self._size <= self._budget:
+                break
+            size, pinned, users = self._entries[name]
+            if name != keep and not pinned and len(users) == 0:
+                self._drop(name)
+                self._evictions += 1
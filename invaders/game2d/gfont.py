@@ -0,0 +1,307 @@
+"""
+Bitmap fonts for 2D game support.
+
+This module supports text that changes often, such as a score.  A :class:`GLabel`
+asks the font engine to rasterize its whole string every time the text changes.  A
+:class:`GBitmapText` instead draws each character as a textured quad, cut out of a
+texture with every character of the font.  That texture is rasterized only once for
+each font and size, so changing the text only rebuilds a few vertices.
+
+Date:   October 18, 2026
+"""
+from kivy.graphics import *
+from kivy.graphics.instructions import *
+from .gobject import GObject
+
+
+# The characters in a bitmap font (the printable ASCII characters except space)
+BITMAP_CHARSET = ''.join(chr(code) for code in range(33,127))
+
+# The number of characters on each line of the glyph texture
+BITMAP_ROW = 16
+
+# The characters between two glyphs on a line of the glyph texture
+BITMAP_GAP = '  '
+
+
+# #mark -
+class BitmapFont(object):
+    """
+    A class representing a font rasterized once into a single texture.
+
+    All of the characters in ``BITMAP_CHARSET`` are rendered by the font engine as a
+    single block of text, ``BITMAP_ROW`` characters per line.  Each character is then
+    a region of that texture, and its advance is its width as measured by the font.
+    Kerning is ignored, which is fine for the pixel fonts in a game HUD.
+
+    Fonts are shared.  Use :meth:`get` rather than the constructor to get a font, so
+    that each font and size is only rasterized once.
+    """
+    # Class attribute for sharing fonts, for each (font_name, font_size)
+    FONT_CACHE = {}
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def texture(self):
+        """
+        The texture with every character of this font.
+
+        **Invariant**: Value is a Kivy texture.
+        """
+        return self._texture
+
+    @property
+    def line_height(self):
+        """
+        The height of a line of text in this font.
+
+        **Invariant**: Value is an ``int`` > 0.
+        """
+        return self._height
+
+
+    # CLASS METHODS
+    @classmethod
+    def get(cls,font_name,font_size):
+        """
+        Returns: The bitmap font for the given name and size, rasterizing it if necessary
+
+        This method must be called once the game is running, as it creates a texture.
+
+        :param font_name: The file name of the .ttf file in the **Fonts** folder
+        :type font_name:  ``str``
+
+        :param font_size: The size of the font in points
+        :type font_size:  ``int`` or ``float`` > 0
+        """
+        key = (font_name,font_size)
+        if not key in cls.FONT_CACHE:
+            cls.FONT_CACHE[key] = cls(font_name,font_size)
+        return cls.FONT_CACHE[key]
+
+
+    # BUILT-IN METHODS
+    def __init__(self,font_name,font_size):
+        """
+        Creates a new bitmap font, rasterizing all of its characters.
+
+        :param font_name: The file name of the .ttf file in the **Fonts** folder
+        :type font_name:  ``str``
+
+        :param font_size: The size of the font in points
+        :type font_size:  ``int`` or ``float`` > 0
+        """
+        from kivy.core.text import Label as CoreLabel
+        lines = [BITMAP_CHARSET[pos:pos+BITMAP_ROW]
+                 for pos in range(0,len(BITMAP_CHARSET),BITMAP_ROW)]
+        label = CoreLabel(text='\n'.join(BITMAP_GAP.join(line) for line in lines),
+                          font_size=font_size,font_name=font_name,halign='left')
+        label.resolve_font_name()
+        label.refresh()
+        self._texture = label.texture
+        self._height  = label.get_extents(BITMAP_CHARSET)[1]
+
+        # A glyph is (region, advance); space has no region
+        self._glyphs = {' ':(None,label.get_extents(' ')[0])}
+        for row in range(len(lines)):
+            y = self._texture.height-(row+1)*self._height
+            for col in range(len(lines[row])):
+                char = lines[row][col]
+                x = 0
+                if col > 0:
+                    x = label.get_extents(BITMAP_GAP.join(lines[row][:col])+BITMAP_GAP)[0]
+                width = label.get_extents(char)[0]
+                region = self._texture.get_region(x,y,width,self._height)
+                self._glyphs[char] = (region,width)
+
+
+    # PUBLIC METHODS
+    def glyph(self,char):
+        """
+        Returns: The pair (region,advance) for the given character
+
+        The region is None for a space.  Characters not in this font are drawn as '?'.
+
+        :param char: The character to look up
+        :type char:  ``str`` of length 1
+        """
+        return self._glyphs[char] if char in self._glyphs else self._glyphs['?']
+
+    def measure(self,text):
+        """
+        Returns: The width of the given line of text in this font
+
+        :param text: The text to measure
+        :type text:  ``str`` with no newlines
+        """
+        width = 0
+        for char in text:
+            width += self.glyph(char)[1]
+        return width
+
+
+# #mark -
+class GBitmapText(GObject):
+    """
+    A class representing a text label drawn with a bitmap font.
+
+    This object is centered at (x,y) like a :class:`GLabel`, and uses ``linecolor`` as
+    the color of the text.  Uses of the escape character '\\n' will result in text that
+    spans multiple lines, aligned according to ``halign``.  The attributes ``width``
+    and ``height`` are computed from the text, and are read-only.
+
+    Unlike a :class:`GLabel`, changing the text does not use the font engine.  The text
+    is drawn as a single mesh of quads, one per character, cut from a :class:`BitmapFont`.
+    So it is fine to change the text every animation frame.
+    """
+
+    # MUTABLE PROPERTIES
+    @property
+    def text(self):
+        """
+        The text for this label.
+
+        **Invariant**: Must be a string"""
+        return self._text
+
+    @text.setter
+    def text(self,value):
+        assert type(value) == str, 'value %s is not a string' % repr(value)
+        if value == self._text:
+            return
+        self._text = value
+        if self._defined:
+            self._layout()
+
+    @property
+    def font_name(self):
+        """
+        The file name for the .ttf file to use as a font
+
+        **Invariant**: Must be a string referring to a .ttf file in folder Fonts"""
+        return self._fname
+
+    @font_name.setter
+    def font_name(self,value):
+        assert type(value) == str, 'value %s is not a font name' % repr(value)
+        self._fname = value
+        if self._defined:
+            self._reset()
+
+    @property
+    def font_size(self):
+        """
+        The size of the text font in points.
+
+        **Invariant**: Must be a positive number (int or float)"""
+        return self._fsize
+
+    @font_size.setter
+    def font_size(self,value):
+        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value > 0, 'value %s is not positive' % repr(value)
+        self._fsize = value
+        if self._defined:
+            self._reset()
+
+    @property
+    def halign(self):
+        """
+        The horizontal alignment of the lines of text.
+
+        **Invariant**: Must be one of 'left', 'right', or 'center'"""
+        return self._halign
+
+    @halign.setter
+    def halign(self,value):
+        assert value in ('left','right','center'), 'value %s is not a valid horizontal alignment' % repr(value)
+        self._halign = value
+        if self._defined:
+            self._layout()
+
+
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """
+        Creates a new bitmap text label.
+
+        To use the constructor for this class, you should provide it with a list of
+        keyword arguments that initialize various attributes.  For example, to create a
+        label containing the word 'Hello' in 15 point RetroGame, use the constructor call::
+
+            GBitmapText(text='Hello',font_name='RetroGame.ttf',font_size=15)
+
+        This class supports the same keywords as :class:`GObject` (except ``width`` and
+        ``height``), as well as ``text``, ``font_name``, ``font_size`` and ``halign``.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self._defined = False
+        self._text = ''
+        self._font = None
+        self._mesh = None
+        self.text = keywords['text'] if 'text' in keywords else ''
+        self.font_name = keywords['font_name'] if 'font_name' in keywords else 'Roboto'
+        self.font_size = keywords['font_size'] if 'font_size' in keywords else 15
+        self.halign = keywords['halign'] if 'halign' in keywords else 'center'
+        keywords = dict(keywords)
+        keywords.pop('width',None)
+        keywords.pop('height',None)
+        GObject.__init__(self,**keywords)
+        if not self.linecolor:
+            self.linecolor = (0,0,0,1)
+        self._reset()
+        self._defined = True
+
+
+    # HIDDEN METHODS
+    def _layout(self):
+        """
+        Rebuilds the quads of the mesh from the text.
+
+        The text is centered on the origin, and the size of this object is updated.
+        """
+        font = self._font
+        lines = self._text.split('\n')
+        widths = [font.measure(line) for line in lines]
+        height = font.line_height
+        self._width  = float(max(max(widths),1))
+        self._height = float(height*len(lines))
+        self._mtrue  = False
+
+        vertices = []
+        indices  = []
+        top = self._height/2.0
+        for row in range(len(lines)):
+            if self._halign == 'left':
+                x = -self._width/2.0
+            elif self._halign == 'right':
+                x = self._width/2.0-widths[row]
+            else:
+                x = -widths[row]/2.0
+            y = top-(row+1)*height
+            for char in lines[row]:
+                region, advance = font.glyph(char)
+                if not region is None:
+                    u = region.tex_coords
+                    base = len(vertices)//4
+                    vertices.extend((x,y,u[0],u[1], x+advance,y,u[2],u[3],
+                                     x+advance,y+height,u[4],u[5], x,y+height,u[6],u[7]))
+                    indices.extend((base,base+1,base+2,base+2,base+3,base))
+                x += advance
+
+        self._mesh.vertices = vertices
+        self._mesh.indices  = indices
+
+    def _reset(self):
+        """
+        Resets the drawing cache.
+        """
+        GObject._reset(self)
+        self._font = BitmapFont.get(self._fname,self._fsize)
+        self._mesh = Mesh(mode='triangles',texture=self._font.texture)
+        self._layout()
+        self._cache.add(self._linecolor)
+        self._cache.add(self._mesh)
+        self._cache.add(PopMatrix())
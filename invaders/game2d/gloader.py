@@ -0,0 +1,303 @@
+"""
+Background asset loading for 2D game support.
+
+This module loads the assets of a game before they are needed.  Normally an image is
+loaded the first time a :class:`GImage` uses it, a sound the first time a
+:class:`Sound` is made from it, and a bitmap font the first time a
+:class:`GBitmapText` uses it.  Loading those can take long enough to drop animation
+frames.
+
+An :class:`AssetLoader` spreads that work over many animation frames, so the game
+keeps animating while it loads.  Images and WAV files are read and decoded on a
+background thread, into pixels and samples.  Everything that must happen on the main
+thread (making a texture or an atlas from the pixels, creating a Kivy sound or the
+voices of a sound effect, rasterizing a font) is done a few assets at a time every
+animation frame.  Once an asset is loaded, it is in the texture, sound or font cache,
+so the game finds it without any further work.
+
+Date:   October 18, 2026
+"""
+from kivy.clock import Clock
+from .app import GameApp
+from .gfont import BitmapFont
+from .gatlas import load_pixels, make_texture
+from .sound import SoundEffect, read_wav
+import threading
+import queue
+import os.path
+
+
+# #mark -
+class AssetLoader(object):
+    """
+    A class that loads a manifest of assets over several animation frames.
+
+    The manifest is a list of images in the **Images** folder, a list of sounds in the
+    **Sounds** folder, a list of sound effects as (file_name, polyphony) pairs (see
+    :class:`SoundEffect`), and a list of bitmap fonts as (font_name, font_size) pairs
+    (see :class:`BitmapFont`).
+
+    The background thread reads and decodes each image into its pixels, and each WAV
+    file into its samples (see :func:`read_wav`).  Making a texture uploads it to the
+    graphics card, Kivy does not guarantee that its audio providers can be created off
+    the main thread, and a font is rasterized into a texture.  So those steps (and only
+    those) happen on the main thread.  Every animation frame, the main thread takes at
+    most ``uploads`` assets from the queue, and puts them in the texture cache, sound
+    cache or sample cache of :class:`GameApp`, the effect cache of :class:`SoundEffect`,
+    or the font cache of :class:`BitmapFont`.  An effect counts as one asset, even
+    though it loads a voice for each copy.  Use :attr:`progress` to show how far along
+    the loader is, and :attr:`done` to tell when it is finished.
+
+    If ``atlas`` is a page size, the images do not become separate textures.  Instead,
+    once the last image is decoded, they are packed into a :class:`TextureAtlas` from
+    the decoded pixels, so building the atlas does not read any files either.
+
+    Assets that are already cached (e.g. images packed into an atlas) are skipped.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def total(self):
+        """
+        The number of assets in the manifest.
+
+        **Invariant**: Value is an ``int`` >= 0.
+        """
+        return self._total
+
+    @property
+    def loaded(self):
+        """
+        The number of assets loaded so far, including any that failed to load.
+
+        **Invariant**: Value is an ``int`` in 0..total.
+        """
+        return self._loaded
+
+    @property
+    def progress(self):
+        """
+        The fraction of the manifest that has been loaded.
+
+        **Invariant**: Value is a ``float`` in 0..1.
+        """
+        return 1.0 if self._total == 0 else self._loaded/float(self._total)
+
+    @property
+    def done(self):
+        """
+        Whether every asset in the manifest has been loaded.
+
+        **Invariant**: Value is a ``bool``.
+        """
+        return self._loaded == self._total
+
+    @property
+    def failed(self):
+        """
+        The file names of the assets that could not be loaded.
+
+        This is the font name for a font, and the file name for a sound effect.
+
+        **Invariant**: Value is a tuple of strings.
+        """
+        return tuple(self._failed)
+
+    @property
+    def atlas(self):
+        """
+        The atlas of the images, once they have all been loaded.
+
+        This is None if the loader was not asked for an atlas, or if it has not
+        finished the images yet.
+
+        **Invariant**: Value is a :class:`TextureAtlas` or None.
+        """
+        return self._atlas
+
+
+    # BUILT-IN METHODS
+    def __init__(self,images=(),sounds=(),fonts=(),uploads=4,effects=(),atlas=None):
+        """
+        Creates a new loader for the given assets.
+
+        The loader does nothing until you call :meth:`start`.
+
+        :param images: The file names of images in the **Images** folder
+        :type images:  ``list`` of ``str``
+
+        :param sounds: The file names of sounds in the **Sounds** folder
+        :type sounds:  ``list`` of ``str``
+
+        :param fonts: The bitmap fonts to rasterize
+        :type fonts:  ``list`` of (font_name, font_size) pairs
+
+        :param uploads: The maximum number of assets to cache per animation frame
+        :type uploads:  ``int`` > 0
+
+        :param effects: The sound effects to create, after the sounds
+        :type effects:  ``list`` of (file_name, polyphony) pairs
+
+        :param atlas: The page size of an atlas for the images (no atlas if None)
+        :type atlas:  ``int`` > 0 or None
+        """
+        assert type(uploads) == int and uploads > 0, '%s is not a valid upload count' % repr(uploads)
+        assert atlas is None or (type(atlas) == int and atlas > 0), '%s is not a valid page size' % repr(atlas)
+        self._jobs = []
+        for name in images:
+            assert GameApp.is_image(name), '%s is not an image file' % repr(name)
+            if not name in GameApp.TEXTURE_CACHE:
+                self._jobs.append(('image',name))
+        for name in sounds:
+            assert GameApp.is_sound(name), '%s is not a sound file' % repr(name)
+            if not name in GameApp.SOUND_CACHE:
+                self._jobs.append(('sound',name))
+        for effect in effects:
+            assert type(effect) == tuple and len(effect) == 2, '%s is not a sound and polyphony' % repr(effect)
+            assert GameApp.is_sound(effect[0]), '%s is not a sound file' % repr(effect[0])
+            assert type(effect[1]) == int and effect[1] > 0, '%s is not a valid polyphony' % repr(effect[1])
+            if not effect in SoundEffect.EFFECT_CACHE:
+                self._jobs.append(('effect',effect))
+        for font in fonts:
+            assert type(font) == tuple and len(font) == 2, '%s is not a font and size' % repr(font)
+            assert type(font[0]) == str, '%s is not a font name' % repr(font[0])
+            assert type(font[1]) in [int,float] and font[1] > 0, '%s is not a font size' % repr(font[1])
+            if not font in BitmapFont.FONT_CACHE:
+                self._jobs.append(('font',font))
+
+        self._uploads = uploads
+        self._total  = len(self._jobs)
+        self._loaded = 0
+        self._failed = []
+        self._queue  = queue.Queue()
+        self._thread = None
+
+        # The decoded images waiting for the atlas, and how many are still to come
+        self._pagesize = atlas
+        self._atlas  = None
+        self._pixels = {}
+        self._images = len([job for job in self._jobs if job[0] == 'image'])
+
+
+    # PUBLIC METHODS
+    def start(self):
+        """
+        Starts loading the assets on a background thread.
+
+        This method must be called once the game is running, such as in ``start``.
+        """
+        if not self._thread is None:
+            return
+        self._thread = threading.Thread(target=self._run,name='AssetLoader')
+        self._thread.daemon = True
+        self._thread.start()
+        if not self.done:
+            Clock.schedule_interval(self._pump,0)
+
+    def finish(self):
+        """
+        Waits for the background thread and caches every remaining asset immediately.
+
+        Use this method if the game needs the assets right away.  It blocks the main
+        thread until the loader is done.
+        """
+        self.start()
+        self._thread.join()
+        Clock.unschedule(self._pump)
+        while not self.done:
+            self._upload(self._queue.get())
+
+
+    # HIDDEN METHODS
+    def _run(self):
+        """
+        Reads and decodes the assets in the manifest (background thread only).
+
+        Each result is put in the queue as (kind, name, data), where data is None if
+        the asset could not be loaded.  The data of an image is its pixels, and the data
+        of a WAV file is the pair (rate, samples).  Any other sound, and every effect and
+        font, is queued as is, since they can only be loaded on the main thread (see
+        :meth:`_upload`).
+        """
+        for kind, name in self._jobs:
+            data = name
+            if kind == 'image':
+                data = load_pixels(os.path.join(GameApp.images,name))
+            elif kind == 'sound' and name.lower().endswith('.wav'):
+                try:
+                    data = read_wav(os.path.join(GameApp.sounds,name))
+                except:
+                    # Not a format we can decode, so leave it to Kivy
+                    data = name
+            self._queue.put((kind,name,data))
+
+    def _pump(self,dt):
+        """
+        Caches at most ``uploads`` decoded assets (main thread only).
+
+        This method is called by the clock every animation frame until the loader
+        is done.
+
+        :param dt: time in seconds since the last call
+        :type dt:  ``int`` or ``float``
+        """
+        for count in range(self._uploads):
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._upload(item)
+        return not self.done
+
+    def _upload(self,item):
+        """
+        Puts an asset in its cache (main thread only).
+
+        Making the texture of an image uploads it to the graphics card.  A sound is
+        created by the Kivy audio provider here, as is every voice of a sound effect,
+        and a font is rasterized into its texture here.  With an atlas, the pixels of an
+        image are kept until the last image arrives, and then the atlas is built.
+
+        :param item: The asset from the queue
+        :type item:  (kind, name, data) tuple
+        """
+        kind, name, data = item
+        try:
+            if data is None:
+                self._failed.append(name if kind in ['image','sound'] else name[0])
+            elif kind == 'image':
+                if not self._pagesize is None:
+                    self._pixels[name] = data
+                elif not name in GameApp.TEXTURE_CACHE:
+                    GameApp.TEXTURE_CACHE[name] = make_texture(data)
+            elif kind == 'sound':
+                if type(data) == tuple:
+                    GameApp.SAMPLE_CACHE[name] = data
+                if GameApp.load_sound(name) is None:
+                    self._failed.append(name)
+            elif kind == 'effect':
+                SoundEffect.get(name[0],name[1])
+            else:
+                BitmapFont.get(name[0],name[1])
+        except:
+            self._failed.append(name if kind in ['image','sound'] else name[0])
+        if kind == 'image':
+            self._images -= 1
+            if self._images == 0 and not self._pagesize is None:
+                self._pack()
+        self._loaded += 1
+
+    def _pack(self):
+        """
+        Builds the atlas from the decoded images (main thread only).
+
+        An image too large for a page of the atlas becomes a texture of its own.
+        """
+        try:
+            self._atlas = GameApp.build_atlas(sorted(self._pixels),self._pagesize,self._pixels)
+            for name in self._pixels:
+                if not name in GameApp.TEXTURE_CACHE:
+                    GameApp.TEXTURE_CACHE[name] = make_texture(self._pixels[name])
+        except:
+            self._failed.extend(name for name in self._pixels if not name in GameApp.TEXTURE_CACHE)
+        self._pixels = {}
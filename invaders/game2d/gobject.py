@@ -10,7 +10,13 @@ Date:   August 1, 2017 (Python 3 version)
 """
 from kivy.graphics import *
 from kivy.graphics.instructions import *
-from introcs.geom import Point2, Matrix
+from introcs.geom import Point2
+from .gaffine import Affine2
+
+
+# True if the package is in production mode, and skips all validation (see __init__.py)
+PRODUCTION = not __debug__
+
 
 def is_color(c):
     """
@@ -30,9 +36,11 @@ def is_color(c):
     if type(c) in [introcs.RGB, introcs.HSV]:
         return True
 
-    if type(c) in [tuple, list] and 3 <= len(c) <= 4:
-        from functools import reduce
-        return reduce(lambda x, y: x and y, map(lambda z: type(z) in [int, float] and 0 <= z <= 1, c))
+    if type(c) in (tuple, list) and 3 <= len(c) <= 4:
+        for z in c:
+            if not type(z) in (int, float) or not 0 <= z <= 1:
+                return False
+        return True
 
     return type(c) == str and (introcs.is_tkcolor(c) or introcs.is_webcolor(c))
 
@@ -53,8 +61,12 @@ def is_num_tuple(t,size):
     :type size:  ``int`` >= 0
     """
     try:
-        from functools import reduce
-        return len(t) == size and reduce(lambda x, y: x and y, map(lambda z: type(z) in [int, float], t))
+        if len(t) != size:
+            return False
+        for z in t:
+            if not type(z) in (int, float):
+                return False
+        return True
     except:
         return False
 
@@ -70,8 +82,10 @@ def is_gobject_list(g):
     :type g:  any
     """
     try:
-        from functools import reduce
-        return len(g) >= 0 and reduce(lambda x, y: x and y, map(lambda z: isinstance(z,GObject), g))
+        for z in g:
+            if not isinstance(z,GObject):
+                return False
+        return len(g) >= 0
     except:
         return False
 
@@ -137,8 +151,9 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         assert value > 0, '%s is not positive' % repr(value)
         self._width = float(value)
+        self._mtrue = False
         if self._defined:
-            self._reset()
+            self._resize()
 
     @property
     def height(self):
@@ -156,8 +171,9 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         assert value > 0, '%s is not positive' % repr(value)
         self._height = float(value)
+        self._mtrue = False
         if self._defined:
-            self._reset()
+            self._resize()
 
     @property
     def scale(self):
@@ -203,9 +219,9 @@ class GObject(object):
     @angle.setter
     def angle(self,value):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
-        diff = np.allclose([self._rotate.angle],[value])
+        same = abs(self._rotate.angle-value) <= 1e-8
         self._rotate.angle = float(value)
-        if not diff:
+        if not same:
             self._mtrue = False
 
     @property
@@ -241,6 +257,10 @@ class GObject(object):
             else:
                 value = introcs.RGB.CreateName(value).glColor()
 
+        if self._defined and not value is None and not self._linecolor is None:
+            self._linecolor.rgba = value[:4]
+            self._recolor()
+            return
         self._linecolor = None if value is None else Color(value[0],value[1],value[2],value[3])
         if self._defined:
             self._reset()
@@ -279,6 +299,10 @@ class GObject(object):
             else:
                 value = introcs.RGB.CreateName(value).glColor()
 
+        if self._defined and not value is None and not self._fillcolor is None:
+            self._fillcolor.rgba = value[:4]
+            self._recolor()
+            return
         self._fillcolor = None if value is None else Color(value[0],value[1],value[2],value[3])
         if self._defined:
             self._reset()
@@ -313,18 +337,13 @@ class GObject(object):
         Changing this value will shift the center of the object so that the left
         edge matches the new value.
 
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        On a rotated object, this is computed with :attr:`bounds`.
 
         **invariant**: Value must be an ``int`` or ``float``.
         """
         if self._rotate.angle == 0.0:
             return self.x-self.width/2.0
-
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return min(p0,p1,p2,p3)
+        return self.bounds[0]
 
     @left.setter
     def left(self,value):
@@ -343,18 +362,13 @@ class GObject(object):
         Changing this value will shift the center of the object so that the right
         edge matches the new value.
 
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        On a rotated object, this is computed with :attr:`bounds`.
 
         **invariant**: Value must be an ``int`` or ``float``.
         """
         if self._rotate.angle == 0.0:
             return self.x+self.width/2.0
-
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return max(p0,p1,p2,p3)
+        return self.bounds[2]
 
     @right.setter
     def right(self,value):
@@ -373,18 +387,13 @@ class GObject(object):
         Changing this value will shift the center of the object so that the top
         edge matches the new value.
 
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        On a rotated object, this is computed with :attr:`bounds`.
 
         **invariant**: Value must be an ``int`` or ``float``.
         """
         if self._rotate.angle == 0.0:
             return self.y+self.height/2.0
-
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return max(p0,p1,p2,p3)
+        return self.bounds[3]
 
     @top.setter
     def top(self,value):
@@ -404,18 +413,13 @@ class GObject(object):
         Changing this value will shift the center of the object so that the bottom
         edge matches the new value.
 
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        On a rotated object, this is computed with :attr:`bounds`.
 
         **invariant**: Value must be an ``int`` or ``float``.
         """
         if self._rotate.angle == 0.0:
             return self.y-self.height/2.0
-
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return min(p0,p1,p2,p3)
+        return self.bounds[1]
 
 
     @bottom.setter
@@ -426,6 +430,46 @@ class GObject(object):
 
 
     # IMMUTABLE PROPERTIES
+    @property
+    def bounds(self):
+        """
+        The axis-aligned bounding box of this shape, as (left, bottom, right, top).
+
+        The box contains the shape after rotation and scaling.  It is computed once
+        each time the shape is moved, rotated, scaled or resized, and cached until then.
+        So it is fast to read it several times per animation frame, such as when you
+        test each corner of a shape for a collision.
+
+        A shape that is not rotated or scaled (the common case) does not need its
+        matrix for this, so its box is computed straight from its position and size.
+
+        **invariant**: Value is a 4-element tuple of floats.
+        """
+        if self._mtrue and not self._aabb is None:
+            return self._aabb
+        if self._rotate.angle == 0 and self._scale.x == 1 and self._scale.y == 1:
+            w = self.width/2.0
+            h = self.height/2.0
+            x = self._trans.x
+            y = self._trans.y
+            self._aabb = (x-w,y-h,x+w,y+h)
+            if not self._mtrue:
+                self._matrix = None
+                self._mtrue = True
+            return self._aabb
+        if not self._mtrue or self._matrix is None:
+            self._build_matrix()
+        if self._aabb is None:
+            w = self.width/2.0
+            h = self.height/2.0
+            p0 = self._matrix._transform(-w,-h)
+            p1 = self._matrix._transform( w,-h)
+            p2 = self._matrix._transform( w, h)
+            p3 = self._matrix._transform(-w, h)
+            self._aabb = (min(p0[0],p1[0],p2[0],p3[0]),min(p0[1],p1[1],p2[1],p3[1]),
+                          max(p0[0],p1[0],p2[0],p3[0]),max(p0[1],p1[1],p2[1],p3[1]))
+        return self._aabb
+
     @property
     def matrix(self):
         """
@@ -434,7 +478,7 @@ class GObject(object):
         This value is constructed dynamically as needed.  It should only be used
         internally in this package
 
-        **invariant**: Either a :class:`Matrix` or ``None``
+        **invariant**: Either an :class:`Affine2` or ``None``
         """
         if not self._mtrue or self._matrix is None:
             self._build_matrix()
@@ -445,14 +489,15 @@ class GObject(object):
         """
         The inverse transformation matrix for this object
 
-        This value is constructed dynamically as needed.  It should only be used
-        internally in this package
+        This value is constructed dynamically as needed (only when it is used, and at
+        most once per change of the transform).  It should only be used internally in
+        this package
 
-        **invariant**: Either a :class:`Matrix` or ``None``
+        **invariant**: Either an :class:`Affine2` or ``None``
         """
         if not self._mtrue or self._matrix is None:
             self._build_matrix()
-        return self._invrse
+        return self._matrix.inverse
 
 
     # BUILT-IN METHODS
@@ -480,6 +525,9 @@ class GObject(object):
         self._defined = False
 
         # Create the Kivy transforms for position and size
+        self._mtrue  = False
+        self._matrix = None
+        self._aabb   = None
         self._trans  = Translate(0,0,0)
         self._rotate = Rotate(angle=0,axis=(0,0,1))
         self._scale  = Scale(1,1,1)
@@ -559,7 +607,7 @@ class GObject(object):
         if self._rotate.angle == 0.0:
             return abs(point[0]-self.x) < self.width/2.0 and abs(point[1]-self.y) < self.height/2.0
 
-        p = self.matrix.inverse()._transform(point[0],point[1])
+        p = self.inverse._transform(point[0],point[1])
         return abs(p[0]) < self.width/2.0 and abs(p[1]) < self.height/2.0
 
     def transform(self,point):
@@ -581,18 +629,23 @@ class GObject(object):
             return self.inverse.transform(point)
         else:
             assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
-            p = self.inverse._transform(point[0],point[2])
+            p = self.inverse._transform(point[0],point[1])
             return Point2(p[0],p[1])
 
     def draw(self, view):
         """
         Draws this shape in the provide view.
 
-        Ideally, the view should be the one provided by :class:`GameApp`.
+        Ideally, the view should be the one provided by :class:`GameApp`.  If the
+        :attr:`bounds` of this shape are completely outside of the view, the shape is
+        culled (not drawn at all).
 
         :param view: view to draw to
         :type view:  :class:`GView`
         """
+        bounds = self._cull_bounds()
+        if not bounds is None and view._cull(bounds):
+            return
         try:
             view.draw(self._cache)
         except:
@@ -609,18 +662,42 @@ class GObject(object):
         self._cache.add(self._rotate)
         self._cache.add(self._scale)
 
+    def _resize(self):
+        """
+        Updates the drawing cache after a change to the width or height.
+
+        By default this resets the drawing cache.  Subclasses that can resize their
+        instructions in place should override this method.
+        """
+        self._reset()
+
+    def _recolor(self):
+        """
+        Updates the drawing cache after a change to a color that was already set.
+
+        The Color instruction has already been changed in place, so by default there is
+        nothing to do.  Subclasses that copy a color elsewhere should override this.
+        """
+        pass
+
+    def _cull_bounds(self):
+        """
+        Returns the box used to cull this shape, or None if it should never be culled.
+
+        By default this is :attr:`bounds`.  Subclasses whose drawing can extend past
+        their bounds should override this method.
+        """
+        return self.bounds
+
     def _build_matrix(self):
         """
-        Builds the transform matrices after a settings change.
+        Builds the transform matrix after a settings change.
+
+        The inverse is not built until it is needed.
         """
-        self._matrix = Matrix()
-        self._matrix.translate(self._trans.x,self._trans.y)
-        self._matrix.rotate(self._rotate.angle)
-        self._matrix.scale(self._scale.x,self._scale.y)
-        self._invrse = Matrix()
-        self._invrse.scale(1.0/self._scale.x,1.0/self._scale.y)
-        self._invrse.rotate(-self._rotate.angle)
-        self._invrse.translate(-self._trans.x,-self._trans.y)
+        self._matrix = Affine2.compose(self._trans.x,self._trans.y,self._rotate.angle,
+                                       self._scale.x,self._scale.y)
+        self._aabb = None
         self._mtrue = True
 
 
@@ -660,6 +737,7 @@ class GScene(GObject):
     def children(self,value):
         assert is_gobject_list(value), '%s is not a list of valid objects' % repr(value)
         self._children = list(value)
+        self._mtrue = False
         if self._defined:
             self._reset()
 
@@ -763,3 +841,12 @@ class GScene(GObject):
         for x in self.children:
             self._cache.add(x._cache)
         self._cache.add(PopMatrix())
+
+    def _cull_bounds(self):
+        """
+        Returns None, as a scene is never culled.
+
+        The size of a scene is not updated when its children move, so it is not safe
+        to cull.  The children are not culled either, as they are drawn with the scene.
+        """
+        return None
@@ -75,9 +75,12 @@ def is_point_tuple(t,minsize):
     :rtype:  ``bool``
     """
     try:
-        from functools import reduce
-        return len(t) % 2 == 0 and len(t) >= 2*minsize and \
-            reduce(lambda x, y: x and y, map(lambda z: type(z) in [int, float], t))
+        if len(t) % 2 != 0 or len(t) < 2*minsize:
+            return False
+        for z in t:
+            if not type(z) in (int, float):
+                return False
+        return True
     except:
         return False
 
@@ -119,6 +122,7 @@ class GPath(GObject):
     def points(self,value):
         assert is_point_tuple(value,2),'value %s is not a valid list of points' %  repr(value)
         self._points = tuple(value)
+        self._mtrue = False
         if self._defined:
             self._reset()
     
@@ -250,6 +254,14 @@ class GPath(GObject):
     
     
     # HIDDEN METHODS
+    def _cull_bounds(self):
+        """
+        Returns the box used to cull this path, which includes the width of the line.
+        """
+        left, bottom, right, top = self.bounds
+        pad = self._linewidth*max(abs(self._scale.x),abs(self._scale.y))
+        return (left-pad,bottom-pad,right+pad,top+pad)
+
     def _reset(self):
         """
         Resets the drawing cache
@@ -297,6 +309,7 @@ class GTriangle(GPath):
         assert is_point_tuple(value,3),'value %s is not a valid list of points' %  repr(value)
         assert len(value) == 6, 'value %s does not have the right length'  %  repr(value)
         self._points = tuple(value)
+        self._mtrue = False
         if self._defined:
             self._reset()
     
@@ -392,7 +405,9 @@ class GPolygon(GPath):
     is 64x64, then the quad polygon (-32,-32,-32,32,32,32,32,-32) will be a rectangle 
     equal to the image.  You can adjust the size of the source image with the attributes
     `source_width` and `source_height`. If the polygon is larger than the image, then the 
-    texture will repeat.
+    texture will repeat.  As repeating changes how the texture is sampled, a textured 
+    polygon loads its own copy of the image, rather than sharing the texture (or atlas 
+    region) in the texture cache.
     
     As with :class:`GPath`, the attributes ``width`` and ``height`` are immutable, and 
     are computed directly from the points
@@ -413,6 +428,7 @@ class GPolygon(GPath):
     def points(self,value):
         assert is_point_tuple(value,3),'value %s is not a valid list of points' %  repr(value)
         self._points = tuple(value)
+        self._mtrue = False
         if self._defined:
             self._reset()
     
@@ -429,6 +445,9 @@ class GPolygon(GPath):
     def source(self,value):
         from .app import GameApp
         assert value is None or GameApp.is_image(value), 'value %s is not an image file' % repr(value)
+        if value != self._source:
+            GameApp.release_texture(self._source,self,True)
+            self._texture = None
         self._source = value
         if self._defined:
             self._reset()
@@ -502,6 +521,8 @@ class GPolygon(GPath):
         :type keywords:  keys are attribute names
         """
         self._defined = False
+        self._source = None
+        self._texture = None
         self.linewidth = keywords['linewidth'] if 'linewidth' in keywords else 0.0
         self.points = keywords['points'] if 'points' in keywords else (-100,-58,0,116,100,-58)
         self.source = keywords['source'] if 'source' in keywords else None
@@ -544,10 +565,13 @@ class GPolygon(GPath):
         """
         Creates the mesh for this polygon
         """
-        size = len(self.points)/2
+        size = len(self.points)//2
         try:
-            texture = Image(source=self.source).texture
-            texture.wrap = 'repeat'
+            # The wrapping copy, as the plain texture may be a region of an atlas
+            if self._texture is None and not self.source is None:
+                from .app import GameApp
+                self._texture = GameApp.load_texture(self.source,self,True)
+            texture = self._texture
             tw = float(texture.width)  if self.source_width is None else self.source_width
             th = float(texture.height) if self.source_height is None else self.source_height
             
@@ -557,7 +581,7 @@ class GPolygon(GPath):
             # Create the fan.
             for x in range(size):
                 pt = self.points[2*x:2*x+2]
-                self._verts += pt+(pt[0]/tw+0.5,pt[1]/th+0.5)
+                verts += pt+(pt[0]/tw+0.5,pt[1]/th+0.5)
             
             # Come back to the beginning
             pt = self.points[0:2]
@@ -12,7 +12,8 @@ from kivy.graphics import *
 from kivy.graphics.instructions import *
 from kivy.uix.label import Label
 from kivy.uix.image import Image
-from .gobject import GObject
+from introcs.geom import Point2
+from .gobject import GObject, is_num_tuple
 from .app import GameApp
 
 class GRectangle(GObject):
@@ -47,7 +48,10 @@ class GRectangle(GObject):
         assert value >= 0, '%s is negative' % repr(value)
         self._linewidth = value
         if self._defined:
-            self._reset()
+            if value > 0 and not self._line is None:
+                self._line.width = value
+            else:
+                self._reset()
     
     
     # BUILT-IN METHODS
@@ -68,6 +72,8 @@ class GRectangle(GObject):
         :type keywords:  keys are attribute names
         """
         self._defined = False
+        self._fill = None
+        self._line = None
         self.linewidth = keywords['linewidth'] if 'linewidth' in keywords else 0.0
         # Always delay the call to parent class, to avoid reset
         GObject.__init__(self,**keywords)
@@ -84,18 +90,32 @@ class GRectangle(GObject):
         x = -self.width/2.0
         y = -self.height/2.0
         
+        self._fill = None
         if not self._fillcolor is None:
-            fill = Rectangle(pos=(x,y), size=(self.width, self.height))
+            self._fill = Rectangle(pos=(x,y), size=(self.width, self.height))
             self._cache.add(self._fillcolor)
-            self._cache.add(fill)
+            self._cache.add(self._fill)
         
+        self._line = None
         if not self._linecolor is None and self.linewidth > 0:
-            line = Line(rectangle=(x,y,self.width,self.height),joint='miter',
-                        close=True,width=self.linewidth)
+            self._line = Line(rectangle=(x,y,self.width,self.height),joint='miter',
+                              close=True,width=self.linewidth)
             self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
+    
+    def _resize(self):
+        """
+        Resizes the fill and border instructions in place.
+        """
+        x = -self.width/2.0
+        y = -self.height/2.0
+        if not self._fill is None:
+            self._fill.pos  = (x,y)
+            self._fill.size = (self.width, self.height)
+        if not self._line is None:
+            self._line.rectangle = (x,y,self.width,self.height)
 
 
 # #mark -
@@ -142,9 +162,9 @@ class GEllipse(GRectangle):
         **Warning**: Using this method on a rotated object may slow down your framerate.
         
         :param point: the point to check
-        :type point: :class:`GPoint`` or a pair of numbers
+        :type point: :class:`Point2`` or a pair of numbers
         """
-        if isinstance(point,GPoint):
+        if isinstance(point,Point2):
             point = (point.x,point.y)
         assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
         
@@ -154,7 +174,7 @@ class GEllipse(GRectangle):
             dx = (point[0]-self.x)*(point[0]-self.x)/(rx*rx)
             dy = (point[1]-self.y)*(point[1]-self.y)/(ry*ry)
         else:
-            p = self.matrix.inverse()._transform(point[0],point[1])
+            p = self.inverse._transform(point[0],point[1])
             dx = p[0]*p[0]/(rx*rx)
             dy = p[1]*p[1]/(ry*ry)
         
@@ -170,17 +190,31 @@ class GEllipse(GRectangle):
         x = -self.width/2.0
         y = -self.height/2.0
         
+        self._fill = None
         if not self._fillcolor is None:
-            fill = Ellipse(pos=(x,y), size=(self.width,self.height))
+            self._fill = Ellipse(pos=(x,y), size=(self.width,self.height))
             self._cache.add(self._fillcolor)
-            self._cache.add(fill)
+            self._cache.add(self._fill)
         
+        self._line = None
         if not self._linecolor is None and self.linewidth > 0:
-            line = Line(ellipse=(x,y,self.width,self.height),close=True,width=self.linewidth)
+            self._line = Line(ellipse=(x,y,self.width,self.height),close=True,width=self.linewidth)
             self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
+    
+    def _resize(self):
+        """
+        Resizes the fill and border instructions in place.
+        """
+        x = -self.width/2.0
+        y = -self.height/2.0
+        if not self._fill is None:
+            self._fill.pos  = (x,y)
+            self._fill.size = (self.width, self.height)
+        if not self._line is None:
+            self._line.ellipse = (x,y,self.width,self.height)
 
 
 # #mark -
@@ -218,9 +252,12 @@ class GImage(GRectangle):
     @source.setter
     def source(self,value):
         assert value is None or GameApp.is_image(value), '%s is not an image file' % repr(value)
+        if self._defined and value != self._source:
+            GameApp.release_texture(self._source,self)
         self._source = value
         if self._defined:
-            self._reset()
+            self._texture = None if value is None else GameApp.load_texture(value,self)
+            self._fill.texture = self._texture
     
     
     # BUILT-IN METHODS
@@ -257,18 +294,19 @@ class GImage(GRectangle):
         x = -self.width/2.0
         y = -self.height/2.0
         
-        self._texture = GameApp.load_texture(self.source)
-        fill = Rectangle(pos=(x,y), size=(self.width, self.height),texture=self._texture)
+        self._texture = GameApp.load_texture(self.source,self)
+        self._fill = Rectangle(pos=(x,y), size=(self.width, self.height),texture=self._texture)
         if not self._fillcolor is None:
             self._cache.add(self._fillcolor)
         else:
             self._cache.add(Color(1,1,1))
-        self._cache.add(fill)
+        self._cache.add(self._fill)
         
+        self._line = None
         if not self._linecolor is None and self.linewidth > 0:
-            line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
+            self._line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
             self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
 
@@ -458,18 +496,13 @@ class GLabel(GRectangle):
         Changing this value will shift the center of the object so that the left
         edge matches the new value.
         
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        On a rotated object, this is computed with :attr:`bounds`.
         
         **Invariant**: Must be an int or float.
         """
         if self._rotate.angle == 0.0:
             return self.x-self.width/2.0
-        
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return min(p0,p1,p2,p3)
+        return self.bounds[0]
     
     @left.setter
     def left(self,value):
@@ -490,18 +523,13 @@ class GLabel(GRectangle):
         Changing this value will shift the center of the object so that the right
         edge matches the new value.
         
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        On a rotated object, this is computed with :attr:`bounds`.
         
         **Invariant**: Must be an int or float.
         """
         if self._rotate.angle == 0.0:
             return self.x+self.width/2.0
-        
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return max(p0,p1,p2,p3)
+        return self.bounds[2]
     
     @right.setter
     def right(self,value):
@@ -522,18 +550,13 @@ class GLabel(GRectangle):
         Changing this value will shift the center of the object so that the top
         edge matches the new value.
         
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
+        On a rotated object, this is computed with :attr:`bounds`.
         
         **Invariant**: Must be an int or float.
         """
         if self._rotate.angle == 0.0:
             return self.y+self.height/2.0
-        
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return max(p0,p1,p2,p3)
+        return self.bounds[3]
     
     @top.setter
     def top(self,value):
@@ -559,12 +582,7 @@ class GLabel(GRectangle):
         """
         if self._rotate.angle == 0.0:
             return self.y-self.height/2.0
-        
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return min(p0,p1,p2,p3)
+        return self.bounds[1]
     
     
     @bottom.setter
@@ -627,6 +645,19 @@ class GLabel(GRectangle):
                 % (s,repr(self.text),repr(self.x),repr(self.y),repr(self.angle))
     
     # HIDDEN METHODS
+    def _resize(self):
+        """
+        Resets the drawing cache, as the text has to be anchored again.
+        """
+        self._reset()
+    
+    def _recolor(self):
+        """
+        Copies the line color to the text.
+        """
+        if self.linecolor:
+            self._label.color = self.linecolor
+    
     def _callback(self,instance=None,value=None):
         """
         A workaround to deal with parameter requirements for callbacks
@@ -661,6 +692,7 @@ class GLabel(GRectangle):
             self._trans.y = self._hv-self.height/2.0
         elif self._vanchor == 'bottom':
             self._trans.y = self._hv+self.height/2.0
+        self._mtrue = False
         
         # Reset the label anchor.
         if self.halign == 'left':
@@ -678,16 +710,18 @@ class GLabel(GRectangle):
         x = -self.width/2.0
         y = -self.height/2.0
         
+        self._fill = None
         if self.fillcolor:
-            fill = Rectangle(pos=(x,y), size=(self.width,self.height))
+            self._fill = Rectangle(pos=(x,y), size=(self.width,self.height))
             self._cache.add(self._fillcolor)
-            self._cache.add(fill)
+            self._cache.add(self._fill)
         
         self._cache.add(self._label.canvas)
         
+        self._line = None
         if self._linewidth > 0:
-            line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
+            self._line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
             self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
@@ -33,7 +33,13 @@ class GSprite(GRectangle):
     
     If the image supports transparency, then this object can be used to represent irregular 
     shapes.  However, the :meth:`contains` method still treats this shape as a  rectangle.
+    
+    The frames of a filmstrip are texture regions.  They are computed once for each
+    source and format, and shared by every sprite that uses that filmstrip.  Changing
+    the frame only changes which region the sprite draws.
     """
+    # Class attribute for sharing frames, as (texture, regions) for each (source, format)
+    FRAME_CACHE = {}
     
     # MUTABLE PROPERTIES
     @property
@@ -48,9 +54,18 @@ class GSprite(GRectangle):
     @source.setter
     def source(self,value):
         assert value is None or GameApp.is_image(value), '%s is not an image file' % repr(value)
+        if self._defined and value != self._source:
+            GameApp.release_texture(self._source,self)
         self._source = value
         if self._defined:
-            self._reset()
+            texture = None if value is None else GameApp.load_texture(value,self)
+            if texture:
+                self._images = GSprite._get_frames(value,self._format,texture)
+                self._texture = self._images[self._frame]
+            else:
+                self._images = (None,)*self.count
+                self._texture = None
+            self._bounds.texture = self._texture
     
     @property
     def count(self):
@@ -103,7 +118,7 @@ class GSprite(GRectangle):
         self.source  = keywords['source'] if 'source' in keywords else None
         self._setFormat(keywords['format'] if 'format' in keywords else (1,1))
         self._frame  = 0
-        self._images = [None]*self.count
+        self._images = (None,)*self.count
         self._bounds = None
         self._texture = None
         GRectangle.__init__(self,**keywords)
@@ -122,6 +137,47 @@ class GSprite(GRectangle):
         assert value[0] > 0 and value[1] > 0, '%s does not have valid values' % repr(value)
         self._format = value
     
+    @classmethod
+    def _get_frames(cls,source,format,texture):
+        """
+        Returns: The frames of the given filmstrip, as a tuple of texture regions
+        
+        The frames are cached for each source and format, and are only recomputed if 
+        the texture for that source has changed (e.g. it was unloaded and loaded again).
+        
+        :param source: The file name of the filmstrip
+        :type source:  ``str``
+        
+        :param format: The filmstrip grid size
+        :type format:  2-element tuple of ints > 0
+        
+        :param texture: The texture for the filmstrip
+        :type texture:  A Kivy texture
+        """
+        key = (source,format)
+        if key in cls.FRAME_CACHE and cls.FRAME_CACHE[key][0] is texture:
+            return cls.FRAME_CACHE[key][1]
+        
+        width  = texture.width/format[1]
+        height = texture.height/format[0]
+        
+        frames = []
+        ty = 0
+        for row in range(format[0]):
+            tx = 0
+            for col in range(format[1]):
+                frames.append(texture.get_region(int(tx),texture.height-int(ty)-int(height),int(width),int(height)))
+                tx += width
+            ty += height
+        frames = tuple(frames)
+        
+        # Drop the frames of textures that have since been evicted or replaced
+        for other in list(cls.FRAME_CACHE.keys()):
+            if not GameApp.TEXTURE_CACHE.get(other[0]) is cls.FRAME_CACHE[other][0]:
+                del cls.FRAME_CACHE[other]
+        cls.FRAME_CACHE[key] = (texture,frames)
+        return frames
+    
     def _reset(self):
         """
         Resets the drawing cache.
@@ -130,33 +186,26 @@ class GSprite(GRectangle):
         x = -self.width/2.0
         y = -self.height/2.0
         
-        texture = GameApp.load_texture(self.source)
+        texture = GameApp.load_texture(self.source,self)
         if texture:
-            width  = texture.width/self._format[1]
-            height = texture.height/self._format[0]
-            
-            ty = 0
-            for row in range(self._format[0]):
-                tx = 0
-                for col in range(self._format[1]):
-                    self._images[row*self._format[1]+col] = texture.get_region(int(tx),texture.height-int(ty)-int(height),int(width),int(height))
-                    tx += width
-                ty += width
+            self._images = GSprite._get_frames(self.source,self._format,texture)
         else:
             print('Failed to load',repr(self.source))
         
         self._texture = self._images[self._frame]
         self._bounds = Rectangle(pos=(x,y), size=(self.width, self.height),texture=self._texture)
+        self._fill = self._bounds
         if not self._fillcolor is None:
             self._cache.add(self._fillcolor)
         else:
             self._cache.add(Color(1,1,1))
         self._cache.add(self._bounds)
         
+        self._line = None
         if not self._linecolor is None and self.linewidth > 0:
-            line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
+            self._line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
             self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
 
@@ -323,8 +323,72 @@ class GView(FloatLayout):
     of this class will not properly display it on the screen.  Instead, you should
     only use the one provided in the `view` attribute of :class:`GameApp`.
     See the documentation of that class for more information.
+
+    By default, the view is cleared at the start of every animation frame, and every
+    object drawn is added to the window again.  In retained mode (see ``retained``)
+    the objects stay in the window between frames.  At the end of each frame, the
+    view only removes the objects that were not drawn this frame and adds the ones
+    that are new.  You still draw every object, every frame, in either mode.
+
+    Objects that are completely outside of the window are culled: they are not added
+    to the window at all, so they cost nothing on the graphics card.  This uses the
+    ``bounds`` of each object, so it is only a few comparisons per object.  An object
+    inside of a :class:`GScene` is drawn with its scene, and is never culled itself.
     """
 
+    # MUTABLE PROPERTIES
+    @property
+    def retained(self):
+        """
+        Whether this view keeps its contents between animation frames.
+
+        If this value is True, the view compares the objects drawn in each frame with
+        the previous frame, and only changes the window where they differ.  This is
+        much faster when most objects are drawn every frame.  Objects are still drawn
+        in the order of the calls to :meth:`draw`.
+
+        **Invariant**: Must be a ``bool``.
+        """
+        return self._retained
+
+    @retained.setter
+    def retained(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        self._retained = value
+        self._frame.clear()
+        self._shown = []
+        self._drawn = []
+        self._contents.clear()
+
+    @property
+    def culling(self):
+        """
+        Whether this view culls objects that are outside of the window.
+
+        Culling is on by default.  Turn it off if an object is drawn outside of its
+        ``bounds`` (e.g. a subclass with a custom drawing cache).
+
+        **Invariant**: Must be a ``bool``.
+        """
+        return self._culling
+
+    @culling.setter
+    def culling(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        self._culling = value
+
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def culled(self):
+        """
+        The number of objects culled in the previous animation frame.
+
+        **Invariant**: Value is an ``int`` >= 0.
+        """
+        return self._culled
+
+
     # BUILT-IN METHODS
     def __init__(self):
         """
@@ -337,10 +401,14 @@ class GView(FloatLayout):
         """
         FloatLayout.__init__(self)
         self._frame = InstructionGroup()
+        self._culling = True
+        self._culled  = 0
+        self._culls   = 0
         self.bind(pos=self._reset)
         self.bind(size=self._reset)
         self._reset()
         self._contents = set()
+        self.retained = False
 
 
     # PUBLIC METHODS
@@ -355,7 +423,10 @@ class GView(FloatLayout):
         :type cmd:  A Kivy graphics command
         """
         if not cmd in self._contents:
-            self._frame.add(cmd)
+            if self._retained:
+                self._drawn.append(cmd)
+            else:
+                self._frame.add(cmd)
             self._contents.add(cmd)
 
     def clear(self):
@@ -363,16 +434,72 @@ class GView(FloatLayout):
         Clears the contents of the view.
 
         This method is called for you automatically at the start of the animation
-        frame.  That way, you are not drawing images on top of one another.
+        frame.  That way, you are not drawing images on top of one another.  In
+        retained mode, the window is not cleared; this just starts a new frame.
         """
-        self._frame.clear()
+        if not self._retained:
+            self._frame.clear()
+        self._drawn = []
         self._contents.clear()
+        self._culled = self._culls
+        self._culls  = 0
 
     # HIDDEN METHODS
+    def _cull(self,bounds):
+        """
+        Returns True if an object with the given bounds should not be drawn.
+
+        This is the case when culling is on and the box is completely outside of the
+        window.  Each culled object is counted in :attr:`culled`.
+
+        :param bounds: the bounding box of the object
+        :type bounds:  (left, bottom, right, top) tuple of numbers
+        """
+        if not self._culling:
+            return False
+        left, bottom, right, top = self._viewport
+        if bounds[2] < left or bounds[0] > right or bounds[3] < bottom or bounds[1] > top:
+            self._culls += 1
+            return True
+        return False
+
+    def _commit(self):
+        """
+        Updates the window to show the commands drawn this frame (retained mode only).
+
+        The commands from the previous frame that were not drawn again are removed.  If
+        the ones that remain are still in the same order, the new commands are inserted
+        at their positions.  Otherwise the whole frame is rebuilt.
+
+        This method is called for you automatically at the end of the animation frame.
+        """
+        if not self._retained or self._drawn == self._shown:
+            return
+
+        kept = []
+        for cmd in self._shown:
+            if cmd in self._contents:
+                kept.append(cmd)
+            else:
+                self._frame.remove(cmd)
+
+        shown = set(self._shown)
+        if kept == [cmd for cmd in self._drawn if cmd in shown]:
+            for pos in range(len(self._drawn)):
+                if not self._drawn[pos] in shown:
+                    self._frame.insert(pos,self._drawn[pos])
+        else:
+            self._frame.clear()
+            for cmd in self._drawn:
+                self._frame.add(cmd)
+        self._shown = self._drawn
+
     def _reset(self,obj=None,value=None):
         """
         Resets the view canvas in response to a resizing event
         """
+        # The window in the coordinates of the drawn objects (see the Scale below)
+        self._viewport = (0.0,0.0,self.width/dp(1),self.height/dp(1))
         self.canvas.clear()
         self.canvas.add(Color(1,1,1))
         self.canvas.add(Rectangle(pos=self.pos,size=self.size))
@@ -3,11 +3,105 @@ Sound classes for 2D game support.
 
 This classes wrap the Kivy audio interface, making it simpler for students to use.
 
+A :class:`Sound` is a single sound that restarts every time it is played.  For sound
+effects that can overlap (such as explosions), use a :class:`SoundEffect` instead.  A
+sound effect has a pool of voices, each of which can play the sound at the same time,
+up to a limit.  When every voice is busy, the oldest one is stopped and reused.
+
+Finally, a :class:`SoundMixer` mixes sound effects in software.  It keeps the WAV files
+as NumPy arrays, and adds every active voice into a single stereo buffer, one block at
+a time, with a gain and pan for each voice.  The mixer does not need an audio device,
+so it can render straight to a WAV file.  It is headless only: Kivy cannot stream
+samples to the speakers, so nothing in the game plays through the mixer.  The game
+plays its effects with :class:`SoundEffect`, and the mixer is for tests and benchmarks.
+
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from kivy.core.audio import SoundLoader
 from .app import GameApp
+import numpy as np
+import struct
+import math
+import os.path
+
+
+def read_wav(path):
+    """
+    Returns the pair (rate, samples) for a PCM WAV file.
+    
+    The samples are a float32 array with one row per frame and one column per channel,
+    in the range -1..1.  The file may have 8, 16, 24 or 32 bit integer samples, or
+    32 bit float samples.
+    
+    This function parses the file itself, so it does not depend on the ``wave`` module
+    (which a game module of the same name would hide).
+    
+    :param path: The path to the WAV file
+    :type path:  ``str``
+    """
+    with open(path,'rb') as file:
+        data = file.read()
+    if data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise IOError('%s is not a WAV file' % repr(path))
+    
+    fmt = None
+    body = None
+    pos = 12
+    while pos+8 <= len(data):
+        chunk, size = struct.unpack_from('<4sI',data,pos)
+        if chunk == b'fmt ':
+            fmt = struct.unpack_from('<HHIIHH',data,pos+8)
+        elif chunk == b'data':
+            body = data[pos+8:pos+8+size]
+        pos += 8+size+(size % 2)
+    if fmt is None or body is None:
+        raise IOError('%s is missing its format or data' % repr(path))
+    
+    code, channels, rate, rest, align, bits = fmt
+    width = bits//8
+    count = len(body)//(width*channels)
+    body = body[:count*width*channels]
+    if code == 3 and bits == 32:
+        samples = np.frombuffer(body,dtype='<f4').astype(np.float32)
+    elif code == 1 and bits == 8:
+        samples = (np.frombuffer(body,dtype=np.uint8).astype(np.float32)-128)/128.0
+    elif code == 1 and bits in (16,32):
+        dtype = '<i2' if bits == 16 else '<i4'
+        samples = np.frombuffer(body,dtype=dtype).astype(np.float32)/float(2**(bits-1))
+    elif code == 1 and bits == 24:
+        raw = np.frombuffer(body,dtype=np.uint8).reshape(-1,3).astype(np.int32)
+        value = raw[:,0] | (raw[:,1] << 8) | (raw[:,2] << 16)
+        value = np.where(value >= 2**23,value-2**24,value)
+        samples = value.astype(np.float32)/float(2**23)
+    else:
+        raise IOError('%s has an unsupported sample format' % repr(path))
+    return (rate,samples.reshape(count,channels))
+
+
+def write_wav(path,rate,samples):
+    """
+    Writes stereo or mono samples to a 16 bit PCM WAV file.
+    
+    :param path: The path to the WAV file
+    :type path:  ``str``
+    
+    :param rate: The sample rate in frames per second
+    :type rate:  ``int`` > 0
+    
+    :param samples: The samples, one row per frame and one column per channel
+    :type samples:  2d NumPy array of int16 (or floats in -1..1)
+    """
+    samples = np.asarray(samples)
+    if samples.dtype != np.int16:
+        samples = (np.clip(samples,-1.0,1.0)*32767).astype(np.int16)
+    channels = samples.shape[1] if samples.ndim == 2 else 1
+    body = samples.astype('<i2').tobytes()
+    with open(path,'wb') as file:
+        file.write(struct.pack('<4sI4s',b'RIFF',36+len(body),b'WAVE'))
+        file.write(struct.pack('<4sIHHIIHH',b'fmt ',16,1,channels,rate,
+                               rate*channels*2,channels*2,16))
+        file.write(struct.pack('<4sI',b'data',len(body)))
+        file.write(body)
 
 
 class Sound(object):
@@ -20,8 +114,11 @@ class Sound(object):
     **Sounds** directory.  Sounds in that folder can be referenced directly by name.
     
     When a sound is played, it cannot be played again until it finishes, or is stopped.  
-    This means that if you want multiple, simultaneous sound effects from the same WAV 
-    file.you will need to create multiple Sound objects.
+
+    The decoded audio is kept in the sound cache of :class:`GameApp` (see
+    :meth:`GameApp.load_sound` and :meth:`GameApp.preload`), so making a Sound does not
+    read the file again.  Sound objects for the same file share that audio, so they
+    cannot play at the same time.  Use a :class:`SoundEffect` for that instead.
     """
     # This class is a simply replacement for the built-in Kivy Sound class.  It is a
     # little better with error handling, since GStreamer appears to be quite unreliable.
@@ -75,10 +172,9 @@ class Sound(object):
         :param source: The string providing the name of a sound file
         :type source:  ``str``
         """
-        from .app import GameApp
         assert GameApp.is_sound(source), 'source %s is not a sound file' % repr(source)
         self._source = source
-        self._sound  = SoundLoader.load(source)
+        self._sound  = GameApp.load_sound(source)
         if self._sound is None:
             raise IOError('Module game2d cannot read the file %s' % repr(source))
     
@@ -103,6 +199,261 @@ class Sound(object):
         self._sound.stop()
 
 
+# #mark -
+class SoundHandle(object):
+    """
+    A class representing a single playback of a :class:`SoundEffect`.
+    
+    A handle is returned by :meth:`SoundEffect.play`.  It controls the voice playing
+    the sound, for as long as that voice is playing it.  Once the sound finishes, or
+    the voice is stolen to play the effect again, the handle does nothing.
+    
+    **You should never construct an object of this class**.  Handles are very cheap,
+    so it is fine to ignore them if you do not need to stop a sound.
+    """
+    
+    # MUTABLE PROPERTIES
+    @property
+    def volume(self):
+        """
+        The volume of this playback.
+        
+        Changing the volume only has an effect while this playback is still playing.
+        
+        **Invariant**: Must float in the range 0..1.
+        """
+        return self._volume
+    
+    @volume.setter
+    def volume(self,value):
+        assert type(value) in [int, float] and value >= 0 and value <= 1, \
+            'value %s is not a valid volume' % repr(value)
+        self._volume = value
+        if self._owns():
+            self._voice[0].volume = value
+    
+    # IMMUTABLE PROPERTIES
+    @property
+    def playing(self):
+        """
+        Whether or not this playback is still playing.
+        
+        **Invariant**: Must be a boolean.
+        """
+        return self._owns() and self._voice[0].state == 'play'
+    
+    def __init__(self,voice,volume):
+        """
+        Creates a handle for the current playback of a voice.
+        
+        :param voice: The voice playing the sound, as [sound, serial, started]
+        :type voice:  ``list``
+        
+        :param volume: The volume of the playback
+        :type volume:  ``float`` in 0..1
+        """
+        self._voice  = voice
+        self._serial = voice[1]
+        self._volume = volume
+    
+    def stop(self):
+        """
+        Stops this playback, if it is still playing.
+        """
+        if self._owns():
+            self._voice[0].stop()
+    
+    def _owns(self):
+        """
+        Returns True if the voice is still playing this playback (and not a later one).
+        """
+        return self._voice[1] == self._serial
+
+
+# #mark -
+class SoundEffect(object):
+    """
+    A class representing a sound effect that can overlap with itself.
+    
+    A sound effect has a pool of voices, each a copy of the same sound.  Every call to
+    :meth:`play` uses an idle voice, so several copies of the effect can play at once.
+    The attribute ``polyphony`` is the number of voices.  If every voice is busy, the 
+    voice that started playing first is stopped and reused (voice stealing).
+    
+    A Kivy sound can only play one copy of itself at a time, so each voice has to be 
+    its own Kivy sound, loaded (and decoded) from the file.  The first voice comes from
+    the sound cache of :class:`GameApp`, and the others are all loaded when the effect
+    is created.  So :meth:`play` never loads a file, and never stalls an animation
+    frame.  An effect must be created on the main thread, as Kivy does not guarantee
+    that its audio providers can be created anywhere else.  To create the effects
+    before the game needs them, give them to :meth:`GameApp.preload`.
+    
+    Sound effects are shared.  Use :meth:`get` rather than the constructor, so that
+    each file is only loaded once for each voice (and polyphony) no matter how many 
+    times the game asks for it.
+    """
+    # Class attribute for sharing effects, for each (source, polyphony)
+    EFFECT_CACHE = {}
+    
+    # MUTABLE PROPERTIES
+    @property
+    def volume(self):
+        """
+        The volume of each new playback of this effect.
+        
+        1 means full volume, 0 means mute.  The default value is 1.
+        
+        **Invariant**: Must float in the range 0..1.
+        """
+        return self._volume
+    
+    @volume.setter
+    def volume(self,value):
+        assert type(value) in [int, float] and value >= 0 and value <= 1, \
+            'value %s is not a valid volume' % repr(value)
+        self._volume = value
+    
+    # IMMUTABLE PROPERTIES
+    @property
+    def source(self):
+        """
+        The source file for this sound effect.
+        
+        **Invariant**: Must be a nonempty string.
+        """
+        return self._source
+    
+    @property
+    def polyphony(self):
+        """
+        The maximum number of copies of this effect that can play at once.
+        
+        **Invariant**: Must be an int > 0.
+        """
+        return self._polyphony
+    
+    @property
+    def voices(self):
+        """
+        The number of voices that could be loaded.
+        
+        This is ``polyphony`` unless a copy of the file failed to load.
+        
+        **Invariant**: Must be an int in 1..polyphony.
+        """
+        return len(self._voices)
+    
+    @property
+    def playing(self):
+        """
+        Whether or not any voice of this effect is playing.
+        
+        **Invariant**: Must be a boolean.
+        """
+        for voice in self._voices:
+            if voice[0].state == 'play':
+                return True
+        return False
+    
+    # CLASS METHODS
+    @classmethod
+    def get(cls,source,polyphony=4):
+        """
+        Returns: The sound effect for the given file and polyphony, loading it if necessary
+        
+        :param source: The string providing the name of a sound file
+        :type source:  ``str``
+        
+        :param polyphony: The maximum number of copies that can play at once
+        :type polyphony:  ``int`` > 0
+        """
+        key = (source,polyphony)
+        if not key in cls.EFFECT_CACHE:
+            cls.EFFECT_CACHE[key] = cls(source,polyphony)
+        return cls.EFFECT_CACHE[key]
+    
+    # BUILT-IN METHODS
+    def __init__(self,source,polyphony=4):
+        """
+        Creates a new sound effect from a file, loading all of its voices.
+        
+        :param source: The string providing the name of a sound file
+        :type source:  ``str``
+        
+        :param polyphony: The maximum number of copies that can play at once
+        :type polyphony:  ``int`` > 0
+        """
+        assert GameApp.is_sound(source), 'source %s is not a sound file' % repr(source)
+        assert type(polyphony) == int and polyphony > 0, '%s is not a valid polyphony' % repr(polyphony)
+        sound = GameApp.load_sound(source)
+        if sound is None:
+            raise IOError('Module game2d cannot read the file %s' % repr(source))
+        
+        self._source = source
+        self._polyphony = polyphony
+        self._volume = 1.0
+        # Each voice is [sound, serial, started]; a serial identifies one playback
+        self._voices = [[sound,0,0]]
+        self._plays  = 0
+        for pos in range(1,polyphony):
+            sound = self._load()
+            if not sound is None:
+                self._voices.append([sound,0,0])
+    
+    def play(self,loop=False,volume=None):
+        """
+        Plays this sound effect on an idle voice, and returns its handle.
+        
+        If every voice is busy, the one that has been playing the longest is stopped
+        and reused.  This method never loads a file.
+        
+        :param loop: Whether or not to loop the sound
+        :type loop:  ``bool``
+        
+        :param volume: The volume of this playback (the effect volume if None)
+        :type volume:  ``float`` in 0..1 or None
+        
+        :return: The handle to control this playback
+        :rtype:  :class:`SoundHandle`
+        """
+        assert volume is None or (type(volume) in [int, float] and 0 <= volume <= 1), \
+            'value %s is not a valid volume' % repr(volume)
+        voice = None
+        for candidate in self._voices:
+            if candidate[0].state != 'play':
+                voice = candidate
+                break
+        if voice is None:
+            voice = min(self._voices,key=lambda candidate: candidate[2])
+            voice[0].stop()
+        
+        self._plays += 1
+        voice[1] += 1
+        voice[2] = self._plays
+        volume = self._volume if volume is None else volume
+        voice[0].volume = volume
+        voice[0].loop = loop
+        voice[0].play()
+        return SoundHandle(voice,volume)
+    
+    def stop(self):
+        """
+        Stops every voice of this sound effect.
+        """
+        for voice in self._voices:
+            voice[0].stop()
+    
+    # HIDDEN METHODS
+    def _load(self):
+        """
+        Returns a new Kivy sound for a voice, or None if it cannot be loaded.
+        
+        Each voice is a separate Kivy sound, decoded from the file again.
+        """
+        from kivy.core.audio import SoundLoader
+        return SoundLoader.load(os.path.join(GameApp.sounds,self._source))
+
+
 # #mark -
 class SoundLibrary(object):
     """
@@ -118,12 +469,32 @@ class SoundLibrary(object):
     To play the sound, we access it as follows::
         
         soundlib['soundname'].play()
+    
+    Each sound is a :class:`SoundEffect`, shared with every other library that loads
+    the same file.  So several copies of a sound can play at once, and a new library
+    does not read any files that were already loaded.  The method :meth:`play` returns
+    a :class:`SoundHandle` to control a single playback.
     """
     
-    def __init__(self):
+    # IMMUTABLE PROPERTIES
+    @property
+    def polyphony(self):
+        """
+        The maximum number of copies of each sound that can play at once.
+        
+        **Invariant**: Must be an int > 0.
+        """
+        return self._polyphony
+    
+    def __init__(self,polyphony=4):
         """
         Creates a new, empty sound library.
+        
+        :param polyphony: The maximum number of copies of each sound that can play at once
+        :type polyphony:  ``int`` > 0
         """
+        assert type(polyphony) == int and polyphony > 0, '%s is not a valid polyphony' % repr(polyphony)
+        self._polyphony = polyphony
         self._data = {}
     
     def __len__(self):
@@ -141,7 +512,7 @@ class SoundLibrary(object):
         :type key:   ``str``
         
         :return: The object for the given sound name.
-        :rtype:  :class:`Sound`
+        :rtype:  :class:`SoundEffect`
         """
         return self._data[key]
     
@@ -155,7 +526,7 @@ class SoundLibrary(object):
         :param filename: The name of the file containing the sound source
         :type filename:  ``str``
         """
-        self._data[key] = Sound(filename)
+        self._data[key] = SoundEffect.get(filename,self._polyphony)
     
     def __delitem__(self, key):
         """
@@ -173,9 +544,362 @@ class SoundLibrary(object):
         """
         return iter(self._data.keys())
     
+    def __contains__(self, key):
+        """
+        :return: True if this library has a sound for the given key.
+        :rtype:  ``bool``
+        """
+        return key in self._data
+    
     def keys(self):
         """
         :return: The keys for this sound dictionary.
         :rtype:  ``iterable``
         """
         return self._data.keys()
+    
+    def play(self, key, loop=False, volume=None):
+        """
+        Plays the sound for the given key, and returns its handle.
+        
+        :param key: The key identifying a sound object
+        :type key:  ``str``
+        
+        :param loop: Whether or not to loop the sound
+        :type loop:  ``bool``
+        
+        :param volume: The volume of this playback (the sound volume if None)
+        :type volume:  ``float`` in 0..1 or None
+        
+        :return: The handle to control this playback
+        :rtype:  :class:`SoundHandle`
+        """
+        return self._data[key].play(loop,volume)
+    
+    def stop(self):
+        """
+        Stops every sound in this library.
+        """
+        for effect in self._data.values():
+            effect.stop()
+
+
+# #mark -
+class SoundMixer(object):
+    """
+    A class that mixes sound effects in software.
+    
+    The mixer keeps each sound file as a NumPy array of stereo samples at the mixer
+    rate.  Every call to :meth:`play` starts a voice, with its own gain and pan.  The
+    method :meth:`mix` then adds all of the active voices into one stereo block, so
+    the cost of playing many effects is a few array operations per voice per block,
+    rather than a separate audio stream for each effect.  At most ``max_voices`` play
+    at once; past that, the voice that started first is stopped (voice stealing).
+    
+    This mixer is headless only.  Kivy has no interface for streaming audio, so the
+    mixer never plays to the speakers, and :class:`GameApp` does not use it.  Use
+    :meth:`render` to write the mix to a WAV file (for example, to test or benchmark
+    the mixing without an audio device), or pass the blocks from :meth:`mix` to a
+    streaming audio library of your own.
+    """
+    
+    # MUTABLE PROPERTIES
+    @property
+    def gain(self):
+        """
+        The master gain applied to the whole mix.
+        
+        **Invariant**: Must be a float >= 0.
+        """
+        return self._gain
+    
+    @gain.setter
+    def gain(self,value):
+        assert type(value) in [int, float] and value >= 0, 'value %s is not a valid gain' % repr(value)
+        self._gain = float(value)
+    
+    # IMMUTABLE PROPERTIES
+    @property
+    def rate(self):
+        """
+        The sample rate of the mix in frames per second.
+        
+        **Invariant**: Must be an int > 0.
+        """
+        return self._rate
+    
+    @property
+    def block(self):
+        """
+        The number of frames in each block returned by :meth:`mix`.
+        
+        **Invariant**: Must be an int > 0.
+        """
+        return self._block
+    
+    @property
+    def max_voices(self):
+        """
+        The maximum number of voices that can play at once.
+        
+        **Invariant**: Must be an int > 0.
+        """
+        return self._maxvoices
+    
+    @property
+    def folder(self):
+        """
+        The folder with the sound files, or None for the **Sounds** folder of the game.
+        
+        **Invariant**: Must be None or a string naming a directory.
+        """
+        return self._folder
+    
+    @property
+    def voices(self):
+        """
+        The number of voices currently playing.
+        
+        **Invariant**: Must be an int in 0..max_voices.
+        """
+        return len(self._voices)
+    
+    # BUILT-IN METHODS
+    def __init__(self,rate=44100,block=1024,max_voices=32,folder=None):
+        """
+        Creates a new mixer with no sounds loaded.
+        
+        By default, the sounds are loaded from the **Sounds** folder of the game.  Set 
+        ``folder`` to load them from another directory instead, such as when there is
+        no running game.
+        
+        :param rate: The sample rate of the mix in frames per second
+        :type rate:  ``int`` > 0
+        
+        :param block: The number of frames in each block
+        :type block:  ``int`` > 0
+        
+        :param max_voices: The maximum number of voices that can play at once
+        :type max_voices:  ``int`` > 0
+        
+        :param folder: The folder with the sound files (the **Sounds** folder if None)
+        :type folder:  ``str`` or None
+        """
+        assert type(rate) == int and rate > 0, '%s is not a valid rate' % repr(rate)
+        assert folder is None or os.path.isdir(folder), '%s is not a folder' % repr(folder)
+        assert type(block) == int and block > 0, '%s is not a valid block size' % repr(block)
+        assert type(max_voices) == int and max_voices > 0, '%s is not a valid voice count' % repr(max_voices)
+        self._rate  = rate
+        self._block = block
+        self._maxvoices = max_voices
+        self._folder = folder
+        self._gain = 1.0
+        self._buffers = {}
+        # Each voice is [id, buffer, position, gains, loop, gain, pan]
+        self._voices = []
+        self._nextid = 0
+    
+    # PUBLIC METHODS
+    def load(self,source):
+        """
+        Returns the samples of a sound file, loading it into the mixer if necessary.
+        
+        The samples are converted to stereo at the mixer rate.  A mono file is played
+        on both channels.  If the file was already decoded by :meth:`GameApp.preload`,
+        the mixer uses those samples instead of reading the file again.
+        
+        :param source: The name of a WAV file in the sound folder
+        :type source:  ``str``
+        
+        :return: The samples, one row per frame
+        :rtype:  (n,2) NumPy array of float32
+        """
+        if source in self._buffers:
+            return self._buffers[source]
+        if self._folder is None:
+            assert GameApp.is_sound(source), 'source %s is not a sound file' % repr(source)
+            path = os.path.join(GameApp.sounds,source)
+        else:
+            path = os.path.join(self._folder,source)
+            assert os.path.isfile(path), 'source %s is not a sound file' % repr(source)
+        if self._folder is None and source in GameApp.SAMPLE_CACHE:
+            rate, samples = GameApp.SAMPLE_CACHE[source]
+        else:
+            rate, samples = read_wav(path)
+        if samples.shape[1] == 1:
+            samples = np.repeat(samples,2,axis=1)
+        elif samples.shape[1] > 2:
+            samples = samples[:,:2]
+        if rate != self._rate and len(samples) > 0:
+            count = int(round(len(samples)*self._rate/float(rate)))
+            times = np.arange(count)*(rate/float(self._rate))
+            source_times = np.arange(len(samples))
+            samples = np.stack([np.interp(times,source_times,samples[:,0]),
+                                np.interp(times,source_times,samples[:,1])],axis=1)
+        samples = np.ascontiguousarray(samples,dtype=np.float32)
+        self._buffers[source] = samples
+        return samples
+    
+    def load_all(self):
+        """
+        Loads every WAV file in the sound folder into the mixer.
+        """
+        if self._folder is None:
+            names = GameApp.manifest()['sounds']
+        else:
+            names = sorted(os.listdir(self._folder))
+        for name in names:
+            if name.lower().endswith('.wav'):
+                self.load(name)
+    
+    def play(self,source,gain=1.0,pan=0.0,loop=False):
+        """
+        Starts a new voice playing the given sound, and returns its id.
+        
+        The pan uses the constant power law, so a sound has the same loudness
+        anywhere between the two speakers.
+        
+        :param source: The name of a WAV file in the **Sounds** folder
+        :type source:  ``str``
+        
+        :param gain: The gain of the voice (1 is the volume of the file)
+        :type gain:  ``int`` or ``float`` >= 0
+        
+        :param pan: The position of the voice, from -1 (left) to 1 (right)
+        :type pan:  ``int`` or ``float`` in -1..1
+        
+        :param loop: Whether or not to loop the sound
+        :type loop:  ``bool``
+        
+        :return: The id of the voice
+        :rtype:  ``int``
+        """
+        buffer = self.load(source)
+        if len(self._voices) >= self._maxvoices:
+            del self._voices[0]
+        self._nextid += 1
+        self._voices.append([self._nextid,buffer,0,self._gains(gain,pan),loop,gain,pan])
+        return self._nextid
+    
+    def adjust(self,voice,gain=None,pan=None):
+        """
+        Changes the gain and/or pan of a voice that is still playing.
+        
+        A value that is None is left as it is.
+        
+        :param voice: The id of the voice
+        :type voice:  ``int``
+        
+        :param gain: The gain of the voice (1 is the volume of the file)
+        :type gain:  ``int`` or ``float`` >= 0, or None
+        
+        :param pan: The position of the voice, from -1 (left) to 1 (right)
+        :type pan:  ``int`` or ``float`` in -1..1, or None
+        """
+        for entry in self._voices:
+            if entry[0] == voice:
+                gain = entry[5] if gain is None else gain
+                pan  = entry[6] if pan is None else pan
+                entry[3] = self._gains(gain,pan)
+                entry[5] = gain
+                entry[6] = pan
+    
+    def playing(self,voice):
+        """
+        Returns True if the voice with the given id is still playing.
+        
+        :param voice: The id of the voice
+        :type voice:  ``int``
+        """
+        for entry in self._voices:
+            if entry[0] == voice:
+                return True
+        return False
+    
+    def stop(self,voice=None):
+        """
+        Stops the voice with the given id, or every voice if it is None.
+        
+        :param voice: The id of the voice
+        :type voice:  ``int`` or None
+        """
+        if voice is None:
+            self._voices = []
+        else:
+            self._voices = [entry for entry in self._voices if entry[0] != voice]
+    
+    def mix(self,frames=None):
+        """
+        Returns the next block of the mix, and advances every voice.
+        
+        Voices that reach the end of their sound (and do not loop) are removed.
+        
+        :param frames: The number of frames to mix (the block size if None)
+        :type frames:  ``int`` > 0 or None
+        
+        :return: The mixed samples, one row per frame
+        :rtype:  (frames,2) NumPy array of int16
+        """
+        frames = self._block if frames is None else frames
+        out = np.zeros((frames,2),dtype=np.float32)
+        active = []
+        for entry in self._voices:
+            buffer = entry[1]
+            length = len(buffer)
+            filled = 0
+            while filled < frames and length > 0:
+                count = min(frames-filled,length-entry[2])
+                out[filled:filled+count] += buffer[entry[2]:entry[2]+count]*entry[3]
+                filled += count
+                entry[2] += count
+                if entry[2] >= length:
+                    if not entry[4]:
+                        break
+                    entry[2] = 0
+            if entry[2] < length:
+                active.append(entry)
+        self._voices = active
+        if self._gain != 1.0:
+            out *= self._gain
+        np.clip(out,-1.0,1.0,out=out)
+        return (out*32767).astype(np.int16)
+    
+    def render(self,path,seconds):
+        """
+        Mixes the given number of seconds and writes the result to a WAV file.
+        
+        The mix is made block by block, exactly as with :meth:`mix`.
+        
+        :param path: The path of the WAV file to write
+        :type path:  ``str``
+        
+        :param seconds: The length of the mix in seconds
+        :type seconds:  ``int`` or ``float`` >= 0
+        """
+        total = int(round(seconds*self._rate))
+        blocks = []
+        while total > 0:
+            frames = min(total,self._block)
+            blocks.append(self.mix(frames))
+            total -= frames
+        if blocks:
+            samples = np.concatenate(blocks)
+        else:
+            samples = np.zeros((0,2),dtype=np.int16)
+        write_wav(path,self._rate,samples)
+    
+    # HIDDEN METHODS
+    def _gains(self,gain,pan):
+        """
+        Returns the left and right gains of a voice as a NumPy array.
+        
+        :param gain: The gain of the voice
+        :type gain:  ``int`` or ``float`` >= 0
+        
+        :param pan: The position of the voice, from -1 (left) to 1 (right)
+        :type pan:  ``int`` or ``float`` in -1..1
+        """
+        assert type(gain) in [int, float] and gain >= 0, 'value %s is not a valid gain' % repr(gain)
+        assert type(pan) in [int, float] and -1 <= pan <= 1, 'value %s is not a valid pan' % repr(pan)
+        angle = (pan+1)*math.pi/4
+        return np.array([gain*math.cos(angle),gain*math.sin(angle)],dtype=np.float32)
@@ -87,10 +87,11 @@ class Ship(GImage):
         Parameter bolt: The laser bolt to check
         Precondition: bolt is of class Bolt
         """
-        return ((self.contains((bolt.left,bolt.top)) or
-            self.contains((bolt.left,bolt.bottom)) or
-            self.contains((bolt.right,bolt.top)) or
-            self.contains((bolt.right,bolt.bottom))) and not bolt.isPlayerBolt())
+        left, bottom, right, top = bolt.bounds
+        return ((self.contains((left,top)) or
+            self.contains((left,bottom)) or
+            self.contains((right,top)) or
+            self.contains((right,bottom))) and not bolt.isPlayerBolt())
 
     # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
 
@@ -148,10 +149,11 @@ class Alien(GImage):
         Parameter bolt: The laser bolt to check
         Precondition: bolt is of class Bolt
         """
-        return ((self.contains((bolt.left,bolt.top)) or
-            self.contains((bolt.left,bolt.bottom)) or
-            self.contains((bolt.right,bolt.top)) or
-            self.contains((bolt.right,bolt.bottom))) and bolt.isPlayerBolt())
+        left, bottom, right, top = bolt.bounds
+        return ((self.contains((left,top)) or
+            self.contains((left,bottom)) or
+            self.contains((right,top)) or
+            self.contains((right,bottom))) and bolt.isPlayerBolt())
 
     # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
 
@@ -191,6 +193,18 @@ class Bolt(GRectangle):
         """
         return self._velocity
 
+    def setVelocity(self,velocity):
+        """
+        Sets the _velocity of the bolt in y direction.
+
+        Wave reuses the same Bolt drawables for different laser bolts, so it needs
+        to change the velocity of a bolt after it is created.
+
+        Parameter velocity: velocity of the bolt
+        Precondition: velocity is a number [int or float]
+        """
+        self._velocity = velocity
+
     # INITIALIZER TO SET THE VELOCITY
     def __init__(self,x,y,width,height,fillcolor,velocity):
         """
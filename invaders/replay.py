@@ -0,0 +1,241 @@
+"""
+Replay module for Alien Invaders
+
+This module records the input of a game so that it can be replayed later.  Because
+every random choice of a Game comes from its seed (see simulation.py), a game is
+completely determined by its seed and the keys held down (and the time step) on every
+frame.  An InputRecorder stores exactly that, one byte of key state per frame, and
+replay steps a new Game with the recording as fast as possible, with no window.
+
+To reproduce the last game saved by Invaders (see REPLAY_FILE in consts.py)::
+
+    recording = InputRecorder.load('session.rec')
+    game = replay(recording)
+
+Like simulation.py, this module never imports game2d, so it runs without Kivy.
+
+Date: October 18, 2026
+"""
+from consts import *
+from simulation import *
+import struct
+
+# PRIMARY RULE: This module may only access consts.py and simulation.py.
+
+
+# The keys recorded on every frame.  Key i is bit i of the byte for the frame.
+REPLAY_KEYS = ('left','right','spacebar','s','q')
+
+# The header at the start of a recording file
+REPLAY_MAGIC = b'AIREC1'
+
+
+class RecordedInput(object):
+    """
+    This class is the input of a single recorded frame.
+
+    It has the method is_key_down, so a Game can be updated with it in place of
+    a GInput.
+
+    INSTANCE ATTRIBUTES:
+        _mask: the keys held down on this frame [int, bit i for REPLAY_KEYS[i]]
+    """
+
+    # INITIALIZER
+    def __init__(self,mask=0):
+        """
+        Initializer: Creates the input for a frame from its key mask.
+
+        Parameter mask: the keys held down on this frame
+        Precondition: mask is an int in 0..255
+        """
+        self._mask = mask
+
+    def is_key_down(self,key):
+        """
+        Returns True if the key was held down on this frame.
+
+        Keys that are not in REPLAY_KEYS are never down.
+
+        Parameter key: the key to test
+        Precondition: key is a string
+        """
+        if key in REPLAY_KEYS:
+            return bool(self._mask & (1 << REPLAY_KEYS.index(key)))
+        return False
+
+
+class InputRecorder(object):
+    """
+    This class records the input of a game, one frame at a time.
+
+    The keys are stored as one byte per frame.  The time steps are run-length
+    encoded, so a game at a fixed tick rate stores a single time step.  The time
+    steps are kept as Python floats, so the replay is bit-for-bit.
+
+    A recorder is given to a Game, which clears it and sets its seed when a game
+    starts, and calls record on every update until that game is complete.  So a
+    recorder holds a single game.
+
+    INSTANCE ATTRIBUTES:
+        _seed:  the seed of the recorded game [int, or None if unknown]
+        _keys:  the key mask of every frame [bytearray]
+        _steps: the time steps as runs [list of [count,dt] with count an int > 0]
+    """
+
+    # GETTERS AND SETTERS
+    def getSeed(self):
+        """
+        Returns self._seed (the seed of the recorded game).
+        """
+        return self._seed
+
+    def setSeed(self,value):
+        """
+        Sets the seed of the recorded game.
+
+        Parameter value: the seed of the game
+        Precondition: value is an int >= 0
+        """
+        assert type(value) == int and value >= 0, repr(value)+' is not a valid seed'
+        self._seed = value
+
+    def getFrames(self):
+        """
+        Returns the number of frames recorded so far.
+        """
+        return len(self._keys)
+
+    # INITIALIZER
+    def __init__(self,seed=None):
+        """
+        Initializer: Creates an empty recording.
+
+        Parameter seed: the seed of the recorded game
+        Precondition: seed is an int >= 0 or None
+        """
+        self._seed = None
+        if not seed is None:
+            self.setSeed(seed)
+        self._keys = bytearray()
+        self._steps = []
+
+    def record(self,input,dt):
+        """
+        Records the input of a single frame.
+
+        Parameter input: the user input for this frame
+        Precondition: input has a method is_key_down [GInput or KeyInput]
+
+        Parameter dt: The time in seconds since last update
+        Precondition: dt is a number (int or float)
+        """
+        mask = 0
+        for pos in range(len(REPLAY_KEYS)):
+            if input.is_key_down(REPLAY_KEYS[pos]):
+                mask |= 1 << pos
+        self._keys.append(mask)
+        dt = float(dt)
+        if self._steps and self._steps[-1][1] == dt:
+            self._steps[-1][0] += 1
+        else:
+            self._steps.append([1,dt])
+
+    def frames(self):
+        """
+        Yields the pair (input,dt) for every recorded frame, in order.
+
+        The input of each frame is a RecordedInput.
+        """
+        pos = 0
+        for count, dt in self._steps:
+            for frame in range(pos,pos+count):
+                yield (RecordedInput(self._keys[frame]),dt)
+            pos += count
+
+    def clear(self):
+        """
+        Removes every recorded frame, keeping the seed.
+        """
+        self._keys = bytearray()
+        self._steps = []
+
+    def save(self,filename):
+        """
+        Saves the recording to a binary file.
+
+        The file is REPLAY_MAGIC, the seed, the number of frames and runs, the key
+        bytes and finally the runs as (count,dt) pairs.
+
+        Parameter filename: the file to write
+        Precondition: filename is a string and the recording has a seed
+        """
+        assert not self._seed is None, 'the recording has no seed'
+        with open(filename,'wb') as file:
+            file.write(REPLAY_MAGIC)
+            file.write(struct.pack('<QII',self._seed,len(self._keys),len(self._steps)))
+            file.write(bytes(self._keys))
+            for count, dt in self._steps:
+                file.write(struct.pack('<Id',count,dt))
+
+    @classmethod
+    def load(cls,filename):
+        """
+        Returns the recording saved in a binary file.
+
+        Parameter filename: the file to read
+        Precondition: filename is a string naming a file written by save
+        """
+        with open(filename,'rb') as file:
+            data = file.read()
+        if data[:len(REPLAY_MAGIC)] != REPLAY_MAGIC:
+            raise IOError(repr(filename)+' is not an Alien Invaders recording')
+        pos = len(REPLAY_MAGIC)
+        seed, frames, runs = struct.unpack_from('<QII',data,pos)
+        pos += struct.calcsize('<QII')
+        result = cls(seed)
+        result._keys = bytearray(data[pos:pos+frames])
+        pos += frames
+        for run in range(runs):
+            count, dt = struct.unpack_from('<Id',data,pos)
+            pos += struct.calcsize('<Id')
+            result._steps.append([count,dt])
+        return result
+
+
+def record(factory=Simulation,seed=None):
+    """
+    Returns a pair (game,recorder) with a new Game recording its input.
+
+    The recorder holds the input of the current game only (see Game).
+
+    Parameter factory: the function to create a new wave
+    Precondition: factory is a callable that returns a Simulation
+
+    Parameter seed: the seed of the game
+    Precondition: seed is an int >= 0, or None to pick one at random
+    """
+    recorder = InputRecorder()
+    game = Game(factory,seed,recorder)
+    recorder.setSeed(game.getSeed())
+    return (game,recorder)
+
+
+def replay(recording,factory=Simulation):
+    """
+    Returns a new Game after playing every frame of the recording.
+
+    The game is stepped as fast as possible, with no window or sound.  By default
+    the waves are plain Simulations, which play exactly like the recorded Waves.
+
+    Parameter recording: the recorded input
+    Precondition: recording is an InputRecorder with a seed
+
+    Parameter factory: the function to create a new wave
+    Precondition: factory is a callable that returns a Simulation
+    """
+    assert not recording.getSeed() is None, 'the recording has no seed'
+    game = Game(factory,recording.getSeed())
+    for input, dt in recording.frames():
+        game.update(input,dt)
+    return game
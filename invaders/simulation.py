@@ -0,0 +1,1252 @@
+"""
+Simulation module for Alien Invaders
+
+This module contains the game logic for Alien Invaders as plain Python data: the alien
+formation, the ship, the laser bolts, the score, the lives and the game states.  Nothing
+in this module builds a Kivy graphics instruction or loads a sound.  That means that a
+game can be stepped thousands of times per second in a process with no window, GL
+context or audio device (for example, to run balance simulations or soak tests).
+
+The classes in wave.py and app.py sit on top of this module.  Wave is a subclass of
+Simulation that adds the drawables and the sound effects, while Invaders drives a Game
+and adds the messages on screen.
+
+To run a game without a window, drive a Game with a KeyInput::
+
+    game  = Game()
+    keys  = KeyInput()
+    keys.press('s')
+    for frame in range(10000):
+        game.update(keys,1/60)
+
+Date: October 18, 2026
+"""
+from consts import *
+import numpy as np
+import random
+import math
+
+# PRIMARY RULE: This module may only access consts.py.  It must never import game2d,
+# models.py, wave.py or app.py, as those modules all import Kivy.
+
+
+class KeyInput(object):
+    """
+    A class representing the keyboard state for a game without a window.
+
+    This class has the same is_key_down method as GInput, so it can be passed to
+    Game and Simulation in place of the input handler of GameApp.  Keys are held
+    down with press and let go with release.
+
+    INSTANCE ATTRIBUTES:
+        _keys: the keys currently held down [set of str]
+    """
+
+    def __init__(self,keys=()):
+        """
+        Initializer: Create a keyboard state with the given keys held down.
+
+        Parameter keys: the keys that are initially held down
+        Precondition: keys is a sequence of key names [str]
+        """
+        self._keys = set(keys)
+
+    def is_key_down(self,key):
+        """
+        Returns: True if key is currently held down; False otherwise.
+
+        Parameter key: the key to test
+        Precondition: key is a key name [str]
+        """
+        return key in self._keys
+
+    def press(self,key):
+        """
+        Holds down the given key.
+
+        Parameter key: the key to press
+        Precondition: key is a key name [str]
+        """
+        self._keys.add(key)
+
+    def release(self,key):
+        """
+        Lets go of the given key (if it is held down).
+
+        Parameter key: the key to release
+        Precondition: key is a key name [str]
+        """
+        self._keys.discard(key)
+
+
+class Body(object):
+    """
+    A class representing an axis-aligned rectangle in the simulation.
+
+    A body has the same geometry as a GRectangle: the attributes x and y refer to the
+    center of the rectangle.  It has none of the Kivy drawing state, so it is cheap to
+    create and to move.
+
+    INSTANCE ATTRIBUTES:
+        x:      the horizontal coordinate of the center [int or float]
+        y:      the vertical coordinate of the center [int or float]
+        width:  the horizontal width of the body [int or float > 0]
+        height: the vertical height of the body [int or float > 0]
+    """
+
+    @property
+    def left(self):
+        """
+        The left edge of this body.
+        """
+        return self.x-self.width/2.0
+
+    @property
+    def right(self):
+        """
+        The right edge of this body.
+        """
+        return self.x+self.width/2.0
+
+    @property
+    def top(self):
+        """
+        The top edge of this body.
+        """
+        return self.y+self.height/2.0
+
+    @property
+    def bottom(self):
+        """
+        The bottom edge of this body.
+        """
+        return self.y-self.height/2.0
+
+    def __init__(self,x,y,width,height):
+        """
+        Initializer: Create a body at (x,y) with given width and height.
+
+        Parameter x: the starting x-coordinate of the body
+        Precondition: x is a number [int or float]
+
+        Parameter y: the starting y-coordinate of the body
+        Precondition: y is a number [int or float]
+
+        Parameter width: width of the body
+        Precondition: width is a number [int or float]
+
+        Parameter height: height of the body
+        Precondition: height is a number [int or float]
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    def contains(self,point):
+        """
+        Returns: True if this body contains the point; False otherwise
+
+        This is the same test as GObject.contains for an unrotated object.
+
+        Parameter point: the point to check
+        Precondition: point is a pair of numbers [int or float]
+        """
+        return (abs(point[0]-self.x) < self.width/2.0 and
+            abs(point[1]-self.y) < self.height/2.0)
+
+
+class ShipBody(Body):
+    """
+    A class to represent the game ship in the simulation.
+
+    The ship collides with the alien bolts.  See BoltPool.touching for the test.
+
+    INSTANCE ATTRIBUTES (in addition to those of Body):
+        prevx:  the horizontal coordinate of the center before the last update
+                [int or float]
+    """
+
+    def __init__(self,x,y,width,height):
+        """
+        Initializer: Create a ship at (x,y) with given width and height.
+
+        Parameter x: the starting x-coordinate of the ship
+        Precondition: x is a number [int or float]
+
+        Parameter y: the starting y-coordinate of the ship
+        Precondition: y is a number [int or float]
+
+        Parameter width: width of the ship
+        Precondition: width is a number [int or float]
+
+        Parameter height: height of the ship
+        Precondition: height is a number [int or float]
+        """
+        super().__init__(x,y,width,height)
+        self.prevx = x
+
+
+class Formation(object):
+    """
+    A class to represent the grid of aliens in the simulation.
+
+    The aliens are stored as a structure of arrays rather than as alien objects.  Each
+    attribute of the aliens is a 2d NumPy array with one entry per grid cell, where row
+    0 is the top row of the formation.  Dead aliens stay in the arrays (they are simply
+    no longer alive), so the cells always form a regular grid.
+
+    The positions of the aliens are stored in formation-local coordinates, relative to
+    the center of the top left cell, and never change.  The formation itself has an
+    offset, the position of that cell in the window.  A march step or a drop only moves
+    the offset, so it costs the same for any number of aliens.  Bolts are tested in the
+    local coordinates by subtracting the offset from the bolt.
+
+    The formation also keeps the number of aliens alive in each row and column, and the
+    extents of the aliens alive.  These are only updated when an alien is killed, so
+    the queries for the edges of the formation do not scan the grid.
+
+    INSTANCE ATTRIBUTES:
+        _x:      the local x-coordinates of the alien centers [2d float array]
+        _y:      the local y-coordinates of the alien centers [2d float array]
+        _offsetx: the x-coordinate of the top left cell in the window [float]
+        _offsety: the y-coordinate of the top left cell in the window [float]
+        _prevx:  the value of _offsetx before the last update [float]
+        _prevy:  the value of _offsety before the last update [float]
+        _alive:  whether each alien is still alive [2d bool array]
+        _types:  the index of the image in ALIEN_IMAGES for each alien [2d int array]
+        _scores: the score value for hitting each alien [2d int array]
+        _count:  the number of aliens alive [int >= 0]
+        _rowcount: the number of aliens alive in each row [list of int >= 0]
+        _colcount: the number of aliens alive in each column [list of int >= 0]
+        _lowest: the row of the most bottom alien alive in each column
+                 [list of int, -1 if the column is empty]
+        _leftcol: the most left column with an alien alive [int, -1 if empty]
+        _rightcol: the most right column with an alien alive [int, -1 if empty]
+        _bottomrow: the most bottom row with an alien alive [int, -1 if empty]
+    """
+
+    # GETTERS AND SETTERS
+    def getRows(self):
+        """
+        Returns the number of rows in the formation.
+        """
+        return self._alive.shape[0]
+
+    def getCols(self):
+        """
+        Returns the number of aliens in each row of the formation.
+        """
+        return self._alive.shape[1]
+
+    def getX(self):
+        """
+        Returns the x-coordinates of the alien centers in the window.
+
+        This is a new array.  Use getLocalX and getOffset to avoid building it.
+        """
+        return self._x+self._offsetx
+
+    def getY(self):
+        """
+        Returns the y-coordinates of the alien centers in the window.
+
+        This is a new array.  Use getLocalY and getOffset to avoid building it.
+        """
+        return self._y+self._offsety
+
+    def getLocalX(self):
+        """
+        Returns self._x (the local x-coordinates of the alien centers).
+        """
+        return self._x
+
+    def getLocalY(self):
+        """
+        Returns self._y (the local y-coordinates of the alien centers).
+        """
+        return self._y
+
+    def getOffset(self):
+        """
+        Returns the position (x,y) of the top left cell in the window.
+
+        Adding this to the local coordinates of an alien gives its position.
+        """
+        return (self._offsetx,self._offsety)
+
+    def getPrevOffset(self):
+        """
+        Returns the offset of the formation before the last update.
+
+        See the method remember.
+        """
+        return (self._prevx,self._prevy)
+
+    def getCount(self):
+        """
+        Returns self._count (the number of aliens alive).
+        """
+        return self._count
+
+    def getAlive(self):
+        """
+        Returns self._alive (whether each alien is still alive).
+        """
+        return self._alive
+
+    def getTypes(self):
+        """
+        Returns self._types (the image index of each alien).
+        """
+        return self._types
+
+    def getScores(self):
+        """
+        Returns self._scores (the score value of each alien).
+        """
+        return self._scores
+
+    def getSource(self,row,col):
+        """
+        Returns the image file for the alien at the given cell.
+
+        Parameter row: the row of the alien
+        Precondition: row is an int in 0..getRows()-1
+
+        Parameter col: the column of the alien
+        Precondition: col is an int in 0..getCols()-1
+        """
+        return ALIEN_IMAGES[self._types[row,col]]
+
+    def getPosition(self,row,col):
+        """
+        Returns the position (x,y) of the alien at the given cell in the window.
+
+        Parameter row: the row of the alien
+        Precondition: row is an int in 0..getRows()-1
+
+        Parameter col: the column of the alien
+        Precondition: col is an int in 0..getCols()-1
+        """
+        return (float(self._x[row,col])+self._offsetx,
+                float(self._y[row,col])+self._offsety)
+
+    # INITIALIZER
+    def __init__(self,rows=ALIEN_ROWS,cols=ALIENS_IN_ROW):
+        """
+        Initializer: Create a full formation with the given number of rows and columns.
+
+        The formation is placed ALIEN_CEILING below the top of the window, with the
+        aliens separated by ALIEN_H_SEP and ALIEN_V_SEP.  Rows use the images in
+        ALIEN_IMAGES from the bottom up, two rows per image, and the score of a row is
+        100 times its position from the bottom (counting from 1).
+
+        Parameter rows: the number of rows of aliens
+        Precondition: rows is an int > 0
+
+        Parameter cols: the number of aliens in each row
+        Precondition: cols is an int > 0
+        """
+        index = np.arange(rows)
+        colx  = np.arange(cols)*(ALIEN_H_SEP+ALIEN_WIDTH)
+        rowy  = -index*(ALIEN_HEIGHT+ALIEN_V_SEP)
+        rowtype = ((rows-1-index) % (len(ALIEN_IMAGES)*2))//2
+        self._offsetx = float(ALIEN_H_SEP+ALIEN_WIDTH/2)
+        self._offsety = float(GAME_HEIGHT-ALIEN_CEILING-ALIEN_HEIGHT/2)
+        self._prevx = self._offsetx
+        self._prevy = self._offsety
+        self._x = np.tile(colx.astype(float),(rows,1))
+        self._y = np.tile(rowy.astype(float)[:,np.newaxis],(1,cols))
+        self._alive  = np.ones((rows,cols),dtype=bool)
+        self._types  = np.tile(rowtype[:,np.newaxis],(1,cols))
+        self._scores = np.tile((100*(rows-index))[:,np.newaxis],(1,cols))
+        self._count = rows*cols
+        self._rowcount = [cols]*rows
+        self._colcount = [rows]*cols
+        self._lowest = [rows-1]*cols
+        self._leftcol = 0
+        self._rightcol = cols-1
+        self._bottomrow = rows-1
+
+    # PUBLIC METHODS
+    def isAlive(self,row,col):
+        """
+        Returns: True if the alien at the given cell is alive; False otherwise
+
+        Parameter row: the row of the alien
+        Precondition: row is an int in 0..getRows()-1
+
+        Parameter col: the column of the alien
+        Precondition: col is an int in 0..getCols()-1
+        """
+        return bool(self._alive[row,col])
+
+    def isEmpty(self):
+        """
+        Returns: True if every alien in the formation is dead; False otherwise
+        """
+        return self._count == 0
+
+    def kill(self,row,col):
+        """
+        Returns: the score value of the alien at the given cell, after killing it
+
+        Parameter row: the row of the alien
+        Precondition: row is an int in 0..getRows()-1 and the alien is alive
+
+        Parameter col: the column of the alien
+        Precondition: col is an int in 0..getCols()-1
+        """
+        self._alive[row,col] = False
+        self._count -= 1
+        self._rowcount[row] -= 1
+        self._colcount[col] -= 1
+        if self._lowest[col] == row:
+            while self._lowest[col] >= 0 and not self._alive[self._lowest[col],col]:
+                self._lowest[col] -= 1
+        if self._count == 0:
+            self._leftcol = self._rightcol = self._bottomrow = -1
+        else:
+            while self._colcount[self._leftcol] == 0:
+                self._leftcol += 1
+            while self._colcount[self._rightcol] == 0:
+                self._rightcol -= 1
+            while self._rowcount[self._bottomrow] == 0:
+                self._bottomrow -= 1
+        return int(self._scores[row,col])
+
+    def remember(self):
+        """
+        Remembers the current offset as the offset before the next update.
+
+        This is called at the start of every update, so getPrevOffset and getOffset
+        are the positions of the formation at the last two updates.
+        """
+        self._prevx = self._offsetx
+        self._prevy = self._offsety
+
+    def march(self,dx):
+        """
+        Moves every alien horizontally by dx.
+
+        Only the offset of the formation changes.
+
+        Parameter dx: the horizontal distance to move
+        Precondition: dx is a number (int or float)
+        """
+        self._offsetx += dx
+
+    def drop(self,dy):
+        """
+        Moves every alien down by dy.
+
+        Only the offset of the formation changes.
+
+        Parameter dy: the vertical distance to move
+        Precondition: dy is a number (int or float)
+        """
+        self._offsety -= dy
+
+    def left(self):
+        """
+        Returns: the left edge of the most left alien alive, or None if there is none
+        """
+        if self._count == 0:
+            return None
+        return float(self._x[0,self._leftcol])+self._offsetx-ALIEN_WIDTH/2.0
+
+    def right(self):
+        """
+        Returns: the right edge of the most right alien alive, or None if there is none
+        """
+        if self._count == 0:
+            return None
+        return float(self._x[0,self._rightcol])+self._offsetx+ALIEN_WIDTH/2.0
+
+    def bottom(self):
+        """
+        Returns: the bottom edge of the most bottom alien alive, or None if there is none
+        """
+        if self._count == 0:
+            return None
+        return float(self._y[self._bottomrow,0])+self._offsety-ALIEN_HEIGHT/2.0
+
+    def lowest(self,col):
+        """
+        Returns: the row of the most bottom alien alive in column col, or -1 if none
+
+        Parameter col: the column to search
+        Precondition: col is an int in 0..getCols()-1
+        """
+        return self._lowest[col]
+
+    def collide(self,left,right,low,high,velocity):
+        """
+        Returns: the (row,col) of the first alien hit by bolt, or None if there is none
+
+        An alien is hit if a corner of the bolt passed through it during the last move
+        of the bolt (as in BoltPool.touching).  If several aliens are hit, this returns the
+        first one along the path of the bolt: the most bottom one for a bolt moving up,
+        and the most top one for a bolt moving down.  Ties are broken by column.
+
+        The formation is a regular grid, so this does not test every alien.  Each side
+        of the bolt falls in the band of at most one column, and the path of the bolt
+        overlaps a contiguous span of rows.  We find both directly from the position of
+        the top left cell, and only test the aliens in those cells.  All of this is
+        done in local coordinates, after moving the bolt by the offset of the formation.
+
+        Parameter left: the left edge of the bolt
+        Precondition: left is a number (int or float)
+
+        Parameter right: the right edge of the bolt
+        Precondition: right is a number (int or float) >= left
+
+        Parameter low: the bottom of the vertical span swept by the bolt
+        Precondition: low is a number (int or float)
+
+        Parameter high: the top of the vertical span swept by the bolt
+        Precondition: high is a number (int or float) >= low
+
+        Parameter velocity: the velocity of the bolt in y direction
+        Precondition: velocity is a number (int or float)
+        """
+        cols = self._candidates(left-self._offsetx,right-self._offsetx,0.0,
+            ALIEN_H_SEP+ALIEN_WIDTH,ALIEN_WIDTH/2.0,self.getCols())
+        if not cols:
+            return None
+        rows = self._span(self._offsety-high,self._offsety-low,0.0,
+            ALIEN_V_SEP+ALIEN_HEIGHT,ALIEN_HEIGHT/2.0,self.getRows())
+        if velocity > 0:
+            rows = reversed(rows)
+        for row in rows:
+            for col in cols:
+                if self._alive[row,col]:
+                    return (row,col)
+        return None
+
+    # HIDDEN METHODS
+    def _candidates(self,low,high,origin,pitch,half,count):
+        """
+        Returns: the grid indices whose band contains low or high, in increasing order
+
+        Cell i of the grid is centered at origin+i*pitch and covers the open interval
+        of radius half about that center.  As the cells do not overlap, each value is
+        in the band of at most one cell: the one whose center is nearest.
+
+        Parameter low: the smaller value to look up
+        Precondition: low is a number (int or float)
+
+        Parameter high: the larger value to look up
+        Precondition: high is a number (int or float) >= low
+
+        Parameter origin: the center of cell 0
+        Precondition: origin is a number (int or float)
+
+        Parameter pitch: the distance between the centers of adjacent cells
+        Precondition: pitch is a number (int or float) >= 2*half
+
+        Parameter half: the radius of a cell
+        Precondition: half is a number (int or float) > 0
+
+        Parameter count: the number of cells
+        Precondition: count is an int > 0
+        """
+        result = []
+        for value in (low,high):
+            index = int(round((value-origin)/pitch))
+            if (0 <= index < count and abs(value-origin-index*pitch) < half and
+                not index in result):
+                result.append(index)
+        return result
+
+    def _span(self,low,high,origin,pitch,half,count):
+        """
+        Returns: the range of grid indices whose band overlaps the interval [low,high]
+
+        Cell i of the grid is centered at origin+i*pitch and covers the open interval
+        of radius half about that center.
+
+        Parameter low: the start of the interval
+        Precondition: low is a number (int or float)
+
+        Parameter high: the end of the interval
+        Precondition: high is a number (int or float) >= low
+
+        Parameter origin: the center of cell 0
+        Precondition: origin is a number (int or float)
+
+        Parameter pitch: the distance between the centers of adjacent cells
+        Precondition: pitch is a number (int or float) > 0
+
+        Parameter half: the radius of a cell
+        Precondition: half is a number (int or float) > 0
+
+        Parameter count: the number of cells
+        Precondition: count is an int > 0
+        """
+        first = math.floor((low-origin-half)/pitch)+1
+        last  = math.ceil((high-origin+half)/pitch)-1
+        return range(max(first,0),min(last,count-1)+1)
+
+
+class BoltPool(object):
+    """
+    A class to store the laser bolts on screen in the simulation.
+
+    The bolts are stored as a structure of arrays with a fixed capacity, rather than
+    as a list of bolt objects.  The live bolts are always the first getCount() entries
+    of each array.  Adding a bolt fills the next free entry, and removing a bolt moves
+    the last live bolt into its place (swap-remove), so neither allocates anything.
+    Every bolt has the size BOLT_WIDTH x BOLT_HEIGHT.
+
+    A bolt remembers its position before the last move, so collisions can test the
+    whole vertical span that it travelled since then.  A fast bolt then cannot tunnel
+    through an alien or the ship between two animation frames.
+
+    INSTANCE ATTRIBUTES:
+        _x:        the x-coordinates of the bolt centers [1d float array]
+        _y:        the y-coordinates of the bolt centers [1d float array]
+        _prevy:    the y-coordinates of the bolt centers before the last move
+                   [1d float array]
+        _velocity: the velocities of the bolts in y direction [1d float array]
+        _player:   whether each bolt was fired by the player [1d bool array]
+        _count:    the number of bolts on screen [int, 0 <= _count <= capacity]
+    """
+
+    # GETTERS AND SETTERS
+    def getCount(self):
+        """
+        Returns self._count (the number of bolts on screen).
+        """
+        return self._count
+
+    def getCapacity(self):
+        """
+        Returns the maximum number of bolts on screen.
+        """
+        return len(self._x)
+
+    def getX(self):
+        """
+        Returns the x-coordinates of the bolts on screen (a view of the first getCount()).
+        """
+        return self._x[:self._count]
+
+    def getY(self):
+        """
+        Returns the y-coordinates of the bolts on screen (a view of the first getCount()).
+        """
+        return self._y[:self._count]
+
+    def getPrevY(self):
+        """
+        Returns the y-coordinates of the bolts on screen before their last move (a view
+        of the first getCount()).
+        """
+        return self._prevy[:self._count]
+
+    def getVelocity(self):
+        """
+        Returns the velocities of the bolts on screen (a view of the first getCount()).
+        """
+        return self._velocity[:self._count]
+
+    def getPlayer(self):
+        """
+        Returns the owner flags of the bolts on screen (a view of the first getCount()).
+        """
+        return self._player[:self._count]
+
+    # INITIALIZER
+    def __init__(self,capacity=BOLT_CAPACITY):
+        """
+        Initializer: Create an empty pool for the given number of bolts.
+
+        Parameter capacity: the maximum number of bolts on screen
+        Precondition: capacity is an int > 0
+        """
+        self._x = np.zeros(capacity)
+        self._y = np.zeros(capacity)
+        self._prevy = np.zeros(capacity)
+        self._velocity = np.zeros(capacity)
+        self._player = np.zeros(capacity,dtype=bool)
+        self._count = 0
+
+    # PUBLIC METHODS
+    def add(self,x,y,velocity,player):
+        """
+        Returns: True if a bolt at (x,y) with the given velocity was added; False if
+        the pool is full
+
+        Parameter x: the starting x-coordinate of the bolt
+        Precondition: x is a number [int or float]
+
+        Parameter y: the starting y-coordinate of the bolt
+        Precondition: y is a number [int or float]
+
+        Parameter velocity: velocity of the bolt
+        Precondition: velocity is a number [int or float]
+
+        Parameter player: whether the bolt was fired by the player (True) or by an
+        alien (False)
+        Precondition: player is a bool
+        """
+        index = self._count
+        if index == len(self._x):
+            return False
+        self._x[index] = x
+        self._y[index] = y
+        self._prevy[index] = y
+        self._velocity[index] = velocity
+        self._player[index] = player
+        self._count += 1
+        return True
+
+    def remove(self,index):
+        """
+        Removes the bolt at the given index, moving the last bolt into its place.
+
+        Parameter index: the index of the bolt to remove
+        Precondition: index is an int in 0..getCount()-1
+        """
+        last = self._count-1
+        if index != last:
+            self._x[index] = self._x[last]
+            self._y[index] = self._y[last]
+            self._prevy[index] = self._prevy[last]
+            self._velocity[index] = self._velocity[last]
+            self._player[index] = self._player[last]
+        self._count = last
+
+    def removeAll(self,indices):
+        """
+        Removes the bolts at the given indices.
+
+        Parameter indices: the indices of the bolts to remove
+        Precondition: indices is a collection of distinct ints in 0..getCount()-1
+        """
+        # Going backwards, the bolt swapped in is never one still to be removed
+        for index in sorted(indices,reverse=True):
+            self.remove(index)
+
+    def removeOffscreen(self):
+        """
+        Removes every bolt that is completely above or below the window.
+        """
+        y = self._y[:self._count]
+        gone = (y-BOLT_HEIGHT/2.0 >= GAME_HEIGHT) | (y+BOLT_HEIGHT/2.0 <= 0)
+        if gone.any():
+            self.removeAll(np.flatnonzero(gone).tolist())
+
+    def move(self):
+        """
+        Moves every bolt vertically by its velocity, remembering where it was.
+        """
+        n = self._count
+        self._prevy[:n] = self._y[:n]
+        self._y[:n] += self._velocity[:n]
+
+    def hasPlayerBolt(self):
+        """
+        Returns: True if there is a bolt fired by the player on screen; False otherwise
+        """
+        return bool(self._player[:self._count].any())
+
+    def getPath(self,index):
+        """
+        Returns: the (left,right,bottom,top) of the area swept by the bolt in its last move.
+
+        The vertical span covers the bolt at its position before the last move, at its
+        current position, and everywhere in between.
+
+        Parameter index: the index of the bolt
+        Precondition: index is an int in 0..getCount()-1
+        """
+        x = float(self._x[index])
+        y = float(self._y[index])
+        prevy = float(self._prevy[index])
+        return (x-BOLT_WIDTH/2.0,x+BOLT_WIDTH/2.0,
+            min(y,prevy)-BOLT_HEIGHT/2.0,max(y,prevy)+BOLT_HEIGHT/2.0)
+
+    def touching(self,body,player):
+        """
+        Returns: the indices of the bolts of the given owner that hit the body
+
+        A bolt hits the body if a corner of the bolt passed through the body during
+        the last move of the bolt.  For a bolt that has not moved, this is the same as
+        testing whether the body contains a corner of the bolt.  All of the bolts are
+        tested at once.
+
+        Parameter body: the body to test
+        Precondition: body is of class Body, wider than BOLT_WIDTH
+
+        Parameter player: whether to test the bolts fired by the player (True) or the
+        bolts fired by the aliens (False)
+        Precondition: player is a bool
+        """
+        n = self._count
+        y = self._y[:n]
+        prevy = self._prevy[:n]
+        # As the body is wider than a bolt, one side is inside iff the centers are close
+        hits = np.abs(self._x[:n]-body.x) < (body.width+BOLT_WIDTH)/2.0
+        hits &= self._player[:n] == player
+        hits &= np.minimum(y,prevy) < body.top+BOLT_HEIGHT/2.0
+        hits &= np.maximum(y,prevy) > body.bottom-BOLT_HEIGHT/2.0
+        return np.flatnonzero(hits).tolist()
+
+
+class Simulation(object):
+    """
+    This class simulates a single wave of Alien Invaders.
+
+    It has the ship, the aliens and any laser bolts on screen as bodies.  It animates
+    the laser bolts, removing any aliens as necessary, and marches the aliens back and
+    forth across the screen until they are all destroyed or they reach the defense
+    line.  It has no drawables and plays no sounds.  Instead, it calls the method
+    _notify whenever something happens that a subclass might want to play a sound for.
+
+    INSTANCE ATTRIBUTES:
+        _ship:   the player ship to control [ShipBody, or None if destroyed]
+        _aliens: the grid of aliens in the wave [Formation]
+        _bolts:  the laser bolts currently on screen [BoltPool]
+        _lives:  the number of lives left  [int >= 0]
+        _time:   The amount of time since the last Alien "step" [number >= 0]
+        _direction: the direction of aliens' march [int, 1 for right, -1 for left]
+        _aliensdown: whether the aliens have been moved down after they touch the edge [bool]
+        _key: whether 'spacebar' key has been pressed or not [bool]
+        _boltstep: the random steps of aliens between each bolt [int, 1 <= _boltstep <= BOLT_RATE]
+        _alienstep: the number of steps aliens march after last alien's bolt [int, 0 <= _alienstep <= _boltstep]
+        _score: the score summed as the player fires aliens [int >= 0]
+        _alienspeed: the speed of aliens march [float]
+        _random: the random number generator of this wave [random.Random]
+    """
+
+    # GETTERS AND SETTERS
+    def getAliens(self):
+        """
+        Returns self._aliens (the grid of aliens in the wave).
+        """
+        return self._aliens
+
+    def getShip(self):
+        """
+        Returns self._ship (the ship to control).
+        """
+        return self._ship
+
+    def getBolts(self):
+        """
+        Returns self._bolts (the laser bolts currently on screen).
+        """
+        return self._bolts
+
+    def getLives(self):
+        """
+        Returns self._lives (the number of lives left).
+        """
+        return self._lives
+
+    def getScore(self):
+        """
+        Returns self._score (the score summed as the player fires aliens).
+        """
+        return self._score
+
+    # INITIALIZER
+    def __init__(self,rows=ALIEN_ROWS,cols=ALIENS_IN_ROW,seed=None):
+        """
+        Initializer: Create a wave with all attributes set in determined values.
+
+        Every random choice of the wave (when the aliens fire and from which column)
+        comes from its own generator, so two waves with the same seed and the same
+        input play out exactly the same way.
+
+        Parameter rows: the number of rows of aliens
+        Precondition: rows is an int > 0
+
+        Parameter cols: the number of aliens in each row
+        Precondition: cols is an int > 0
+
+        Parameter seed: the seed of the random number generator
+        Precondition: seed is an int, or None to seed from the system
+        """
+        self._random = random.Random(seed)
+        self._aliens = Formation(rows,cols)
+        self._ship = None
+        self.setNewShip()
+        self._time = 0
+        self._direction = 1
+        self._aliensdown = True
+        self._bolts = BoltPool()
+        self._key = False
+        self._boltstep = self._random.randint(1,BOLT_RATE)
+        self._alienstep = 0
+        self._lives = SHIP_LIVES
+        self._score = 0
+        self._alienspeed = ALIEN_SPEED
+
+    # UPDATE METHODS
+    def step(self,input,dt):
+        """
+        Advances the wave by one animation frame.
+
+        This calls updateBolts, updateShip and updateAliens in the same order as
+        Invaders does.  Before that, it remembers where the ship and the aliens are,
+        so that they can be drawn between their last two positions (like the bolts).
+
+        Parameter input: the user input, used to control the ship
+        Precondition: input has a method is_key_down [GInput or KeyInput]
+
+        Parameter dt: The time in seconds since last update
+        Precondition: dt is a number (int or float)
+        """
+        if not self._ship is None:
+            self._ship.prevx = self._ship.x
+        self._aliens.remember()
+        self.updateBolts(input)
+        self.updateShip(input)
+        self.updateAliens(dt)
+
+    def isWinning(self):
+        """
+        Returns: True if there is no aliens on the screen; False otherwise
+        """
+        return self._aliens.isEmpty()
+
+    def isLosing(self):
+        """
+        Returns: True if the most bottom alien touches the defense line;
+        False otherwise (including when there are no aliens left)
+        """
+        if self._aliens.isEmpty():
+            return False
+        return self._aliens.bottom() <= DEFENSE_LINE
+
+    def updateShip(self,input):
+        """
+        This method checks for a 'left' or 'right' key press, and if there is
+        one, move the ship left or right. However, the ship cannot be moved
+        outside the screen.
+
+        Parameter input: the user input, used to control the ship
+        Precondition: input has a method is_key_down [GInput or KeyInput]
+        """
+        if not self._ship is None:
+            if input.is_key_down('left') and self._ship.x >= SHIP_WIDTH/2:
+                self._ship.x -= SHIP_MOVEMENT
+            if (input.is_key_down('right') and
+                self._ship.x <= GAME_WIDTH-SHIP_WIDTH/2):
+                self._ship.x += SHIP_MOVEMENT
+
+    def updateAliens(self,dt):
+        """
+        Moves the aliens in the respective direction (left, right or down)
+
+        Parameter dt: The time in seconds since last update
+        Precondition: dt is a number (int or float)
+        """
+        self._time += dt
+        if self._time >= self._alienspeed and not self.isWinning():
+            if (GAME_WIDTH-self._aliens.right() <= ALIEN_H_SEP
+                or self._aliens.left() <= ALIEN_H_SEP):
+                self._handleEdge()
+            else:
+                self._aliens.march(self._direction*ALIEN_H_WALK)
+            self._time = 0
+            self._alienstep += 1
+
+    def updateBolts(self,input):
+        """
+        Generates, moves and removes the laser bolts fired by the ship and aliens.
+
+        Once the bolts have moved, this method resolves all of their collisions with
+        the aliens and the ship for this animation frame.
+
+        Parameter input: the user input, used to fire the ship bolts
+        Precondition: input has a method is_key_down [GInput or KeyInput]
+        """
+        self._bolts.removeOffscreen()
+        self._aliensBolt()
+        self._bolts.move()
+        self._shipBolt(input,self._bolts.hasPlayerBolt())
+        self._resolveCollisions()
+
+    def setNewShip(self):
+        """
+        Creates a new ship with the same setting as in the beginning
+        """
+        self._ship = ShipBody(GAME_WIDTH/2,SHIP_BOTTOM+SHIP_HEIGHT/2,SHIP_WIDTH,
+            SHIP_HEIGHT)
+
+    # HELPER METHODS FOR EVENTS
+    def _notify(self,event):
+        """
+        Reports that something happened in the wave.
+
+        This method does nothing.  Subclasses override it to react to the events
+        (e.g. to play a sound effect).  The events are 'shipbolt' (the ship fired),
+        'alienbolt' (an alien fired), 'shipexplode' (the ship was hit) and
+        'alienexplode' (an alien was hit).
+
+        Parameter event: the name of the event
+        Precondition: event is one of the strings above [str]
+        """
+        pass
+
+    # HELPER METHODS FOR COLLISION DETECTION
+    def _resolveCollisions(self):
+        """
+        Resolves every collision between the laser bolts and the ship or the aliens
+
+        This is a single collision pass for the animation frame.  It first gathers all
+        of the contacts: the alien hit by each player bolt, and every alien bolt that
+        hits the ship.  Then it resolves them together.  The ship loses one life (no
+        matter how many bolts hit it), each alien hit is removed with its score and
+        speed-up, and all of the bolts that hit something are removed at once.  If two
+        bolts hit the same alien, only the first one is used up.
+        """
+        if self._bolts.getCount() == 0:
+            return
+
+        alienhits = []
+        shiphits = []
+        for index in np.flatnonzero(self._bolts.getPlayer()).tolist():
+            left, right, low, high = self._bolts.getPath(index)
+            cell = self._aliens.collide(left,right,low,high,
+                float(self._bolts.getVelocity()[index]))
+            if not cell is None:
+                alienhits.append((index,cell))
+        if not self._ship is None:
+            shiphits = self._bolts.touching(self._ship,False)
+
+        if len(alienhits) == 0 and len(shiphits) == 0:
+            return
+
+        removed = set(shiphits)
+        if len(shiphits) > 0:
+            self._ship = None
+            self._notify('shipexplode')
+            self._lives -= 1
+        for index, (row, col) in alienhits:
+            if self._aliens.isAlive(row,col):
+                self._score += self._aliens.kill(row,col)
+                self._notify('alienexplode')
+                self._alienspeed = self._alienspeed*0.98
+                removed.add(index)
+        self._bolts.removeAll(removed)
+
+    def _handleEdge(self):
+        """
+        Moves the aliens down when it reaches the left or right ends
+        """
+        if self._aliensdown == False:
+            self._aliens.drop(ALIEN_V_WALK)
+            self._direction = (-1)*self._direction
+            self._aliensdown = True
+        else:
+            self._aliens.march(self._direction*ALIEN_H_WALK)
+            self._aliensdown = False
+
+    def _aliensBolt(self):
+        """
+        Generates the bolt fired by the alien
+
+        No bolt is fired once every alien is dead, since there is no column
+        left to fire from.
+        """
+        if self._aliens.isEmpty():
+            return
+        if self._alienstep == self._boltstep:
+            cols = self._aliens.getCols()
+            aliencol = self._random.randint(0,cols-1)
+            k = self._aliens.lowest(aliencol)
+            while k < 0:
+                aliencol = self._random.randint(0,cols-1)
+                k = self._aliens.lowest(aliencol)
+            x, y = self._aliens.getPosition(k,aliencol)
+            if self._bolts.add(x,y-ALIEN_HEIGHT/2,-BOLT_SPEED,False):
+                self._notify('alienbolt')
+            self._boltstep = self._random.randint(1,BOLT_RATE)
+            self._alienstep = 0
+
+    def _shipBolt(self,input,check):
+        """
+        Generates the bolt fired by the ship
+
+        Parameter input: the user input
+        Precondition: input has a method is_key_down [GInput or KeyInput]
+
+        Parameter check: the boolean value of whether there is a bolt fired by
+        the ship showed on the screen
+        Precondition: boolean variable [bool]
+        """
+        if not check and not self._ship is None:
+            current = input.is_key_down('spacebar')
+            if current and self._key == False:
+                if self._bolts.add(self._ship.x,
+                    SHIP_BOTTOM+SHIP_HEIGHT+BOLT_HEIGHT/2,BOLT_SPEED,True):
+                    self._notify('shipbolt')
+            self._key = current
+
+
+class Game(object):
+    """
+    This class simulates the game states of Alien Invaders.
+
+    It is the state machine that Invaders used to run on its own: it starts a new wave
+    when 's' is pressed, steps the active wave, pauses when the ship is destroyed and
+    completes the game when the wave is won or lost.  The waves are created by calling
+    a factory, so Invaders can ask for a Wave (with drawables and sounds) while a
+    simulation without a window uses a plain Simulation.
+
+    INSTANCE ATTRIBUTES:
+        _state:   the current state of the game represented as a value from consts.py
+                  [one of STATE_INACTIVE, STATE_NEWWAVE, STATE_ACTIVE, STATE_PAUSED,
+                  STATE_CONTINUE, STATE_COMPLETE]
+        _wave:    the current wave [Simulation, or None if _state is STATE_INACTIVE]
+        _factory: the function to create a new wave [callable returning a Simulation]
+        _key:     whether 's' key has been pressed or not [bool]
+        _seed:    the seed of the current (or next) game [int]
+        _random:  the generator for the seeds of new waves, seeded with _seed when
+                  a game starts [random.Random]
+        _session: the generator for the seeds of the games after the first
+                  [random.Random]
+        _recorder: the recorder of the input of the current game [object with
+                  methods record, clear and setSeed, or None]
+    """
+
+    # GETTERS AND SETTERS
+    def getState(self):
+        """
+        Returns self._state (the current state of the game).
+        """
+        return self._state
+
+    def getWave(self):
+        """
+        Returns self._wave (the current wave, or None if there is none).
+        """
+        return self._wave
+
+    def getSeed(self):
+        """
+        Returns self._seed (the seed of the current game).
+
+        A game created with this seed and given the same input replays exactly.
+        Once a game is complete and the state returns to STATE_INACTIVE, this is the
+        seed of the next game.
+        """
+        return self._seed
+
+    # INITIALIZER
+    def __init__(self,factory=Simulation,seed=None,recorder=None):
+        """
+        Initializer: Create a game in STATE_INACTIVE with no wave.
+
+        Each new wave is seeded from a generator seeded with the seed of the game,
+        so the whole game is determined by its seed and its input.  The first game
+        played has the given seed, and each game after it gets a new seed.
+
+        The recorder only holds the input of one game.  It is cleared when a game
+        starts, and records every frame from the 's' key press that starts the game
+        to the frame that completes it.  So saving the recorder once the game is
+        complete saves exactly that game.
+
+        Parameter factory: the function to create a new wave
+        Precondition: factory is a callable that returns a Simulation and accepts
+        a keyword argument seed
+
+        Parameter seed: the seed of the game
+        Precondition: seed is an int, or None to pick one at random
+
+        Parameter recorder: the recorder of the input of each game
+        Precondition: recorder is None or has methods record(input,dt), clear()
+        and setSeed(seed) [e.g. an InputRecorder]
+        """
+        if seed is None:
+            seed = random.randrange(2**63)
+        self._seed = seed
+        self._random = random.Random(seed)
+        self._session = random.Random(seed)
+        self._recorder = recorder
+        self._factory = factory
+        self._state = STATE_INACTIVE
+        self._wave = None
+        self._key = False
+
+    # UPDATE METHOD
+    def update(self,input,dt):
+        """
+        Animates a single frame of the game.
+
+        Parameter input: the user input, used to control the ship and change state
+        Precondition: input has a method is_key_down [GInput or KeyInput]
+
+        Parameter dt: The time in seconds since last update
+        Precondition: dt is a number (int or float)
+        """
+        self._determineState(input)
+        if self._state == STATE_NEWWAVE:
+            self._startGame()
+        if (not self._recorder is None and self._state != STATE_INACTIVE and
+            self._state != STATE_COMPLETE):
+            self._recorder.record(input,dt)
+        if self._state == STATE_NEWWAVE:
+            self._wave = self._factory(seed=self._random.randrange(2**63))
+            self._state = STATE_ACTIVE
+        elif self._state == STATE_ACTIVE:
+            self._wave.step(input,dt)
+            self._determineWinOrLose()
+        elif self._state == STATE_CONTINUE:
+            self._wave.setNewShip()
+            self._state = STATE_ACTIVE
+
+    # HELPER METHODS FOR THE STATES
+    def _startGame(self):
+        """
+        Seeds the waves of a new game and starts a new recording for it.
+        """
+        self._random = random.Random(self._seed)
+        if not self._recorder is None:
+            self._recorder.clear()
+            self._recorder.setSeed(self._seed)
+
+    def _determineState(self,input):
+        """
+        Determines the current state and assigns it to self._state
+
+        This method checks for a 's' key press, and if there is one, changes the
+        state to the next value.  Completing the game returns it to STATE_INACTIVE,
+        and picks the seed of the next game.
+
+        Parameter input: the user input
+        Precondition: input has a method is_key_down [GInput or KeyInput]
+        """
+        current = input.is_key_down('s')
+        check = current and self._key == False
+        if check:
+            if self._state == STATE_INACTIVE:
+                self._state = STATE_NEWWAVE
+            elif self._state == STATE_PAUSED:
+                self._state = STATE_CONTINUE
+            elif self._state == STATE_COMPLETE:
+                self._state = STATE_INACTIVE
+                self._wave = None
+                self._seed = self._session.randrange(2**63)
+        self._key = current
+
+    def _determineWinOrLose(self):
+        """
+        Determines whether the player wins or loses the game
+
+        If the player is winning or losing, turns into STATE_COMPLETE.  If the ship
+        is destroyed but the player still have lives left, turns into STATE_PAUSED.
+        """
+        if self._wave.isWinning():
+            self._state = STATE_COMPLETE
+        elif self._wave.getShip() is None and self._wave.getLives() > 0:
+            self._state = STATE_PAUSED
+        elif ((self._wave.getShip() is None and
+            self._wave.getLives() <= 0) or self._wave.isLosing()):
+            self._state = STATE_COMPLETE
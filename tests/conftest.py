@@ -0,0 +1,18 @@
+"""
+Test configuration for Alien Invaders
+
+The game modules import each other as top-level modules (consts, simulation, ...),
+as they do when the game runs from its folder.  So the invaders folder is put on the
+path here.  Kivy is told not to parse the command line of pytest.
+
+Date: October 18, 2026
+"""
+import os
+import sys
+
+os.environ.setdefault('KIVY_NO_ARGS','1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG','1')
+
+GAME_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),'invaders')
+if not GAME_FOLDER in sys.path:
+    sys.path.insert(0,GAME_FOLDER)
@@ -0,0 +1,101 @@
+"""
+Unit tests for the shelf packing of TextureAtlas
+
+Uploading a page needs a window, so these tests use an atlas that makes up its
+images and records each page instead of uploading it.
+
+Date: October 18, 2026
+"""
+from game2d.gatlas import TextureAtlas
+import numpy as np
+import random
+
+
+class PackedAtlas(TextureAtlas):
+    """
+    An atlas of blank images of given sizes, which records its pages.
+
+    INSTANCE ATTRIBUTES:
+        sizes:  the (width,height) of each image, by name [dict]
+        placed: the images on each page, as (name,x,y,w,h) [list of lists]
+        reads:  the file paths read by the atlas [list of str]
+    """
+
+    def __init__(self,sizes,size=256,padding=1,pixels=None):
+        """
+        Initializer: Packs blank images of the given sizes.
+
+        Parameter sizes: the (width,height) of each image, by name
+        Precondition: sizes is a dict of pairs of ints > 0
+
+        Parameter size: the maximum width and height of a page
+        Precondition: size is an int > 0
+
+        Parameter padding: the number of empty pixels around each image
+        Precondition: padding is an int >= 0
+
+        Parameter pixels: the decoded images, by name (made up if None)
+        Precondition: pixels is None or a dict of RGBA arrays
+        """
+        self.sizes = sizes
+        self.placed = []
+        self.reads = []
+        super().__init__(sorted(sizes),'',size,padding,pixels)
+
+    def _load(self,path):
+        """
+        Returns a blank image with the size of the file path.
+        """
+        self.reads.append(path)
+        width, height = self.sizes[path]
+        return np.zeros((height,width,4),dtype=np.uint8)
+
+    def _upload(self,buffer,height,placed):
+        """
+        Records the images on a page instead of uploading it.
+        """
+        self.placed.append(list(placed))
+        for name, x, y, w, h in placed:
+            self._regions[name] = (len(self.placed)-1,x,y,w,h)
+
+
+def test_shelf_packing_has_no_overlap():
+    """
+    Tests that padded images never overlap and stay inside their page.
+    """
+    rng = random.Random(5)
+    sizes = {}
+    for pos in range(120):
+        sizes['image%d.png' % pos] = (rng.randint(1,60),rng.randint(1,60))
+    sizes['huge.png'] = (300,10)
+    padding = 1
+    atlas = PackedAtlas(sizes,256,padding)
+
+    assert not 'huge.png' in atlas
+    assert sorted(atlas.names) == sorted(name for name in sizes if name != 'huge.png')
+    assert len(atlas.placed) > 1
+    for page in atlas.placed:
+        boxes = []
+        for name, x, y, w, h in page:
+            assert (w,h) == sizes[name]
+            left, bottom = x-padding, y-padding
+            right, top = x+w+padding, y+h+padding
+            assert left >= 0 and bottom >= 0 and right <= 256 and top <= 256
+            for other in boxes:
+                assert (right <= other[0] or left >= other[2] or
+                        top <= other[1] or bottom >= other[3])
+            boxes.append((left,bottom,right,top))
+
+
+def test_decoded_pixels_are_not_read_again():
+    """
+    Tests that an atlas built from decoded pixels never reads a file.
+    """
+    sizes = {'ship.png':(44,44),'alien1.png':(36,36),'broken.png':(10,10)}
+    pixels = {'ship.png':np.full((44,44,4),7,dtype=np.uint8),
+              'alien1.png':np.full((36,36,4),9,dtype=np.uint8),'broken.png':None}
+    atlas = PackedAtlas(sizes,256,1,pixels)
+
+    assert atlas.reads == []
+    assert sorted(atlas.names) == ['alien1.png','ship.png']
+    assert [item[0] for item in atlas.placed[0]] == ['ship.png','alien1.png']
@@ -0,0 +1,49 @@
+"""
+Unit tests for the bolt pool of Alien Invaders
+
+Date: October 18, 2026
+"""
+from consts import *
+from simulation import *
+
+
+def test_pool_remove_while_iterating():
+    """
+    Tests removing bolts from the pool in the middle of a pass over the pool.
+    """
+    bolts = BoltPool(16)
+    for index in range(16):
+        assert bolts.add(float(index),float(index),BOLT_SPEED,index < 8)
+    assert not bolts.add(99.0,99.0,BOLT_SPEED,True)
+
+    # Remove the odd bolts, revisiting the index that a bolt was swapped into
+    index = 0
+    while index < bolts.getCount():
+        if int(bolts.getX()[index]) % 2 == 1:
+            bolts.remove(index)
+        else:
+            index += 1
+    assert sorted(bolts.getX().tolist()) == [float(n) for n in range(0,16,2)]
+    assert bolts.getX().tolist() == bolts.getY().tolist()
+    assert (bolts.getPlayer() == (bolts.getX() < 8)).all()
+
+    bolts.removeAll([0,2,5])
+    assert bolts.getCount() == 5
+    assert bolts.getX().tolist() == bolts.getY().tolist()
+    assert (bolts.getPlayer() == (bolts.getX() < 8)).all()
+
+
+def test_owner_does_not_depend_on_speed():
+    """
+    Tests that the owner of a bolt is the one given, whatever its velocity.
+    """
+    bolts = BoltPool(4)
+    bolts.add(100.0,100.0,2*BOLT_SPEED,True)
+    bolts.add(200.0,300.0,-BOLT_SPEED,False)
+    bolts.add(300.0,300.0,BOLT_SPEED,False)
+    assert bolts.getPlayer().tolist() == [True,False,False]
+    assert bolts.hasPlayerBolt()
+
+    ship = ShipBody(300.0,300.0,SHIP_WIDTH,SHIP_HEIGHT)
+    assert list(bolts.touching(ship,False)) == [2]
+    assert list(bolts.touching(ship,True)) == []
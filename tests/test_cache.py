@@ -0,0 +1,59 @@
+"""
+Unit tests for the texture cache of game2d
+
+Loading a real texture needs a window, so these tests cache stand-in objects that
+only have a size and a color format.
+
+Date: October 18, 2026
+"""
+from game2d.gcache import TextureCache
+import gc
+
+
+class FakeTexture(object):
+    """
+    A stand-in for a Kivy texture, with a size and a color format.
+    """
+
+    def __init__(self,width,height):
+        """
+        Initializer: Makes a stand-in for an RGBA texture of the given size.
+
+        Parameter width: the width in pixels
+        Precondition: width is an int > 0
+
+        Parameter height: the height in pixels
+        Precondition: height is an int > 0
+        """
+        self.width = width
+        self.height = height
+        self.colorfmt = 'rgba'
+
+
+class User(object):
+    """
+    An object that draws a texture.
+    """
+    pass
+
+
+def test_deleted_user_is_evicted_on_lookup():
+    """
+    Tests that a texture is evicted once its only user is deleted, without a release.
+    """
+    cache = TextureCache(budget=16)
+    cache.add('ship.png',FakeTexture(2,2))
+    user = User()
+    cache.acquire('ship.png',user)
+    cache.add(('ship.png','repeat'),FakeTexture(1,1))
+    assert cache.refs('ship.png') == 1
+
+    # The repeat copy is unused, so it goes over budget; the used texture stays
+    cache.budget = 4
+    assert list(cache) == ['ship.png']
+
+    del user
+    gc.collect()
+    assert cache.lookup('alien1.png') is None
+    assert len(cache) == 0
+    assert cache.evictions == 2
@@ -0,0 +1,179 @@
+"""
+Unit tests for the alien formation of Alien Invaders
+
+Date: October 18, 2026
+"""
+from consts import *
+from simulation import *
+import random
+
+
+def test_formation_arrays():
+    """
+    Tests the arrays of a new formation, and killing an alien.
+    """
+    aliens = Formation(4,6)
+    assert aliens.getAlive().shape == (4,6)
+    assert aliens.getCount() == 24
+    assert aliens.getScores()[:,0].tolist() == [400,300,200,100]
+    assert aliens.getTypes()[:,0].tolist() == [1,1,0,0]
+    assert aliens.getSource(3,0) == ALIEN_IMAGES[0]
+
+    x0, y0 = aliens.getPosition(0,0)
+    x1, y1 = aliens.getPosition(1,2)
+    assert x1-x0 == 2*(ALIEN_WIDTH+ALIEN_H_SEP)
+    assert y0-y1 == ALIEN_HEIGHT+ALIEN_V_SEP
+
+    assert aliens.kill(1,2) == 300
+    assert not aliens.isAlive(1,2)
+    assert aliens.getCount() == 23
+    assert int(aliens.getAlive().sum()) == 23
+
+    aliens.march(5)
+    aliens.drop(7)
+    assert aliens.getPosition(0,0) == (x0+5,y0-7)
+
+
+def bruteCollide(aliens,left,right,low,high,velocity):
+    """
+    Returns: the (row,col) of the first alien hit, found by testing every alien
+
+    This is the test described by Formation.collide, with no grid.
+
+    Parameter aliens: the formation to test
+    Precondition: aliens is a Formation
+
+    Parameter left, right, low, high: the area covered by the bolt
+    Precondition: left <= right and low <= high are numbers
+
+    Parameter velocity: the velocity of the bolt in y direction
+    Precondition: velocity is a number (int or float)
+    """
+    hits = []
+    for row in range(aliens.getRows()):
+        for col in range(aliens.getCols()):
+            if aliens.isAlive(row,col):
+                x, y = aliens.getPosition(row,col)
+                inside = (abs(left-x) < ALIEN_WIDTH/2.0 or
+                    abs(right-x) < ALIEN_WIDTH/2.0)
+                if inside and low < y+ALIEN_HEIGHT/2.0 and high > y-ALIEN_HEIGHT/2.0:
+                    hits.append((row,col))
+    if not hits:
+        return None
+    if velocity > 0:
+        return min(hits,key=lambda cell: (-cell[0],cell[1]))
+    return min(hits)
+
+
+def randomFormation(rng):
+    """
+    Returns: a formation with random aliens killed, at a random offset
+
+    Parameter rng: the random number generator
+    Precondition: rng is a random.Random
+    """
+    aliens = Formation()
+    for kill in range(rng.randrange(aliens.getCount())):
+        row = rng.randrange(aliens.getRows())
+        col = rng.randrange(aliens.getCols())
+        if aliens.isAlive(row,col):
+            aliens.kill(row,col)
+    aliens.march(rng.uniform(-40,40))
+    aliens.drop(rng.uniform(0,200))
+    return aliens
+
+
+def test_grid_matches_brute_force():
+    """
+    Tests the grid lookup of Formation.collide against every alien.
+    """
+    rng = random.Random(1)
+    hits = 0
+    for trial in range(50):
+        aliens = randomFormation(rng)
+        for bolt in range(200):
+            x = rng.uniform(0,GAME_WIDTH)
+            y = rng.uniform(0,GAME_HEIGHT)
+            velocity = rng.choice([BOLT_SPEED,-BOLT_SPEED])
+            left, right = x-BOLT_WIDTH/2.0, x+BOLT_WIDTH/2.0
+            low, high = y-BOLT_HEIGHT/2.0, y+BOLT_HEIGHT/2.0
+            cell = aliens.collide(left,right,low,high,velocity)
+            assert cell == bruteCollide(aliens,left,right,low,high,velocity)
+            hits += not cell is None
+    assert hits > 0
+
+
+def test_extents_follow_kills():
+    """
+    Tests the edges of the formation as aliens are killed, down to none.
+    """
+    aliens = Formation(3,4)
+    x, y = aliens.getPosition(2,3)
+    assert aliens.right() == x+ALIEN_WIDTH/2.0
+    assert aliens.bottom() == y-ALIEN_HEIGHT/2.0
+    for row in range(3):
+        aliens.kill(row,3)
+    assert aliens.right() == x-ALIEN_H_SEP-ALIEN_WIDTH/2.0
+    assert aliens.lowest(3) == -1
+    for col in range(3):
+        aliens.kill(2,col)
+    assert aliens.bottom() == y+ALIEN_V_SEP+ALIEN_HEIGHT/2.0
+    assert aliens.lowest(0) == 1
+
+    for row in range(2):
+        for col in range(3):
+            aliens.kill(row,col)
+    assert aliens.isEmpty()
+    assert aliens.left() is None and aliens.right() is None
+    assert aliens.bottom() is None
+
+
+def test_empty_wave_is_not_losing():
+    """
+    Tests that a wave with no aliens left is never losing.
+    """
+    wave = Simulation(seed=1)
+    aliens = wave.getAliens()
+    for row in range(aliens.getRows()):
+        for col in range(aliens.getCols()):
+            aliens.kill(row,col)
+    aliens.drop(GAME_HEIGHT)
+    assert wave.isWinning() and not wave.isLosing()
+
+
+def test_swept_path_matches_brute_force():
+    """
+    Tests Formation.collide for the paths of fast bolts against every alien.
+    """
+    rng = random.Random(2)
+    for trial in range(30):
+        aliens = randomFormation(rng)
+        for bolt in range(200):
+            x = rng.uniform(0,GAME_WIDTH)
+            y = rng.uniform(0,GAME_HEIGHT)
+            velocity = rng.choice([150,-150,BOLT_SPEED])
+            prevy = y-velocity
+            left, right = x-BOLT_WIDTH/2.0, x+BOLT_WIDTH/2.0
+            low = min(y,prevy)-BOLT_HEIGHT/2.0
+            high = max(y,prevy)+BOLT_HEIGHT/2.0
+            assert (aliens.collide(left,right,low,high,velocity) ==
+                bruteCollide(aliens,left,right,low,high,velocity))
+
+
+def test_fast_bolt_does_not_tunnel():
+    """
+    Tests that a bolt moving further than an alien in one step still hits it.
+    """
+    aliens = Formation()
+    bottom = aliens.getRows()-1
+    x, y = aliens.getPosition(bottom,3)
+    bolts = BoltPool()
+    speed = 2*(ALIEN_HEIGHT+ALIEN_V_SEP)
+    bolts.add(x,y-ALIEN_HEIGHT-BOLT_HEIGHT,speed,True)
+    bolts.move()
+
+    # The bolt ends up past the bottom alien, but its path went through it
+    left, right, low, high = bolts.getPath(0)
+    now = float(bolts.getY()[0])
+    assert now-BOLT_HEIGHT/2.0 > y+ALIEN_HEIGHT/2.0
+    assert aliens.collide(left,right,low,high,speed) == (bottom,3)
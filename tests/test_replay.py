@@ -0,0 +1,74 @@
+"""
+Unit tests for the recording and replay of Alien Invaders
+
+These tests play games with scripted random input, save the recording of each game,
+and check that replaying the saved file ends in exactly the same state.
+
+Date: October 18, 2026
+"""
+from consts import *
+from simulation import *
+from replay import *
+import random
+
+
+def snapshot(game):
+    """
+    Returns: the state of the game and of its wave, as a tuple
+
+    Parameter game: the game to describe
+    Precondition: game is a Game with a wave
+    """
+    wave = game.getWave()
+    aliens = wave.getAliens()
+    bolts = wave.getBolts()
+    ship = wave.getShip()
+    return (game.getState(),wave.getScore(),wave.getLives(),
+        None if ship is None else ship.x,aliens.getOffset(),
+        aliens.getAlive().tolist(),bolts.getX().tolist(),bolts.getY().tolist())
+
+
+def test_saved_games_replay_exactly(tmp_path):
+    """
+    Tests that each saved game replays to the same final state, on its own.
+    """
+    filename = str(tmp_path/'game.rec')
+    game, recorder = record(seed=7)
+    rng = random.Random(3)
+    keys = ('left','right','spacebar','s')
+    finished = 0
+    frames = 0
+    while finished < 3 and frames < 100000:
+        previous = game.getState()
+        game.update(KeyInput([key for key in keys if rng.random() < 0.3]),1/60)
+        frames += 1
+        if game.getState() == STATE_COMPLETE and previous != STATE_COMPLETE:
+            recorder.save(filename)
+            recording = InputRecorder.load(filename)
+            assert recording.getSeed() == game.getSeed()
+            assert recording.getFrames() == recorder.getFrames() < frames
+            assert snapshot(replay(recording)) == snapshot(game)
+            finished += 1
+    assert finished == 3
+
+
+def test_recording_round_trip(tmp_path):
+    """
+    Tests that a saved recording loads with the same seed, keys and time steps.
+    """
+    filename = str(tmp_path/'input.rec')
+    recorder = InputRecorder(12345)
+    script = [(['left'],0.5),(['left','spacebar'],0.5),([],0.25),(['q','s'],0.25)]
+    for keys, dt in script:
+        recorder.record(KeyInput(keys),dt)
+    recorder.save(filename)
+
+    loaded = InputRecorder.load(filename)
+    assert loaded.getSeed() == 12345
+    assert loaded.getFrames() == len(script)
+    frames = list(loaded.frames())
+    for pos in range(len(script)):
+        input, dt = frames[pos]
+        assert dt == script[pos][1]
+        for key in REPLAY_KEYS:
+            assert input.is_key_down(key) == (key in script[pos][0])
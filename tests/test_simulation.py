@@ -0,0 +1,35 @@
+"""
+Unit tests for the headless wave simulation of Alien Invaders
+
+Date: October 18, 2026
+"""
+from consts import *
+from simulation import *
+
+
+def test_wave_steps_without_a_window():
+    """
+    Tests that a wave runs with no window, moving the ship and the aliens.
+    """
+    wave = Simulation(seed=3)
+    x = wave.getShip().x
+    offset = wave.getAliens().getOffset()
+    keys = KeyInput(['left'])
+    for frame in range(60):
+        wave.step(keys,1/60)
+    assert wave.getShip().x < x
+    assert wave.getAliens().getOffset() != offset
+
+
+def test_no_alien_fire_when_empty():
+    """
+    Tests that the aliens do not fire (or loop forever) once they are all dead.
+    """
+    wave = Simulation(seed=3)
+    aliens = wave.getAliens()
+    for row in range(aliens.getRows()):
+        for col in range(aliens.getCols()):
+            aliens.kill(row,col)
+    wave._alienstep = wave._boltstep
+    wave._aliensBolt()
+    assert wave.getBolts().getCount() == 0
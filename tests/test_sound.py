@@ -0,0 +1,89 @@
+"""
+Unit tests for the WAV functions and the software mixer of game2d
+
+The mixer never opens an audio device, so these tests run without a window.  They
+write their own WAV files, so they do not depend on the sounds of the game.
+
+Date: October 18, 2026
+"""
+from game2d.sound import SoundMixer, read_wav, write_wav
+import numpy as np
+import math
+
+
+def test_wav_round_trip(tmp_path):
+    """
+    Tests that 16 bit samples written to a WAV file read back unchanged.
+    """
+    filename = str(tmp_path/'noise.wav')
+    samples = np.random.RandomState(0).randint(-32768,32768,size=(1000,2)).astype(np.int16)
+    write_wav(filename,22050,samples)
+    rate, result = read_wav(filename)
+    assert rate == 22050
+    assert result.shape == (1000,2)
+    assert np.array_equal(np.round(result*32768).astype(np.int32),samples.astype(np.int32))
+
+    # Float samples are clipped to -1..1 when written
+    write_wav(filename,8000,np.array([[2.0],[-2.0],[0.5]]))
+    rate, result = read_wav(filename)
+    assert rate == 8000 and result.shape == (3,1)
+    assert np.allclose(result[:,0],[32767/32768.0,-32767/32768.0,16383/32768.0])
+
+
+def test_mixer_pan(tmp_path):
+    """
+    Tests the constant power pan of a mixer voice, and adjusting one setting.
+    """
+    write_wav(str(tmp_path/'tone.wav'),44100,np.full((100,1),0.5))
+    mixer = SoundMixer(folder=str(tmp_path))
+    voice = mixer.play('tone.wav',pan=-1.0)
+    block = mixer.mix(10)
+    assert np.all(block[:,0] > 0) and np.all(block[:,1] == 0)
+
+    mixer.adjust(voice,pan=1.0)
+    block = mixer.mix(10)
+    assert np.all(block[:,0] == 0) and np.all(block[:,1] > 0)
+
+    # Changing the gain keeps the pan
+    mixer.adjust(voice,gain=0.5)
+    block = mixer.mix(10)
+    assert np.all(block[:,0] == 0) and abs(int(block[0,1])-8191) <= 1
+
+    mixer.adjust(voice,pan=0.0)
+    block = mixer.mix(10)
+    expected = 0.5*0.5*math.cos(math.pi/4)*32767
+    assert np.all(np.abs(block-expected) <= 1)
+
+
+def test_mixer_clips_and_ends(tmp_path):
+    """
+    Tests that a loud mix is clipped (not wrapped), and that voices end or loop.
+    """
+    write_wav(str(tmp_path/'loud.wav'),44100,np.full((50,2),0.9))
+    mixer = SoundMixer(block=40,max_voices=2,folder=str(tmp_path))
+    first = mixer.play('loud.wav',pan=-1.0)
+    mixer.play('loud.wav',pan=-1.0)
+    mixer.play('loud.wav',pan=-1.0,loop=True)
+    assert mixer.voices == 2 and not mixer.playing(first)
+
+    block = mixer.mix()
+    assert block.shape == (40,2) and block.dtype == np.int16
+    assert np.all(block[:,0] == 32767)
+
+    # The second voice ends after 50 frames, the looping voice does not
+    mixer.mix()
+    assert mixer.voices == 1
+    block = mixer.mix()
+    assert np.all(block[:,0] > 0)
+
+
+def test_mixer_resamples(tmp_path):
+    """
+    Tests that a mono file at another rate is loaded as stereo at the mixer rate.
+    """
+    write_wav(str(tmp_path/'slow.wav'),22050,np.linspace(-0.5,0.5,100)[:,np.newaxis])
+    mixer = SoundMixer(rate=44100,folder=str(tmp_path))
+    samples = mixer.load('slow.wav')
+    assert samples.shape == (200,2)
+    assert np.array_equal(samples[:,0],samples[:,1])
+    assert abs(samples[0,0]+0.5) < 1e-3 and abs(samples[-1,0]-0.5) < 1e-2